@@ -1,7 +1,14 @@
+import os
+import sys
+import time
 import streamlit as st
 import google.generativeai as genai
-from pypdf import PdfReader
-from docx import Document
+
+# Shared helpers live in growth_ops/ at the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from growth_ops.llm_cache import generate_text
+from growth_ops.ingest import extract_text, DocumentTooLarge
+from growth_ops.ats import ats_match, format_ats_report
 
 # --- CONFIGURATION ---
 st.set_page_config(page_title="AI Resume Roaster", page_icon="💀", layout="wide")
@@ -20,22 +27,22 @@ except Exception as e:
 
 # --- HELPER FUNCTIONS ---
 def get_pdf_text(uploaded_file):
-    text = ""
     try:
-        reader = PdfReader(uploaded_file)
-        for page in reader.pages:
-            text += page.extract_text()
+        return extract_text(uploaded_file)
+    except DocumentTooLarge as e:
+        st.error(str(e))
     except:
         st.error("Could not read PDF. Make sure it's not encrypted.")
-    return text
+    return ""
 
 def get_docx_text(uploaded_file):
     try:
-        doc = Document(uploaded_file)
-        return "\n".join([para.text for para in doc.paragraphs])
+        return extract_text(uploaded_file)
+    except DocumentTooLarge as e:
+        st.error(str(e))
     except:
         st.error("Could not read Word file.")
-        return ""
+    return ""
 
 # --- THE UI ---
 st.title("💀 The AI Resume Roaster")
@@ -72,6 +79,7 @@ col1, col2, col3 = st.columns(3)
 roast_btn = col1.button("🔥 Roast My Resume")
 match_btn = col2.button("📊 Check ATS Score")
 fix_btn = col3.button("✨ Rewrite My Bullet Points")
+regenerate = st.checkbox("🔄 Regenerate (skip the cached answer)")
 
 # --- THE BRAIN ---
 if roast_btn and resume_text:
@@ -85,28 +93,19 @@ if roast_btn and resume_text:
         Be mean, be funny, but be honest. Point out vague words, lack of numbers, and fluff.
         """
         try:
-            response = model.generate_content(prompt)
+            result = generate_text(model, prompt, use_cache=not regenerate)
             st.error("💀 The Roast:")
-            st.markdown(response.text)
+            st.markdown(result)
         except Exception as e:
             st.error(f"AI Error: {e}")
 
 elif match_btn and resume_text and jd_text:
-    with st.spinner("Calculating match percentage..."):
-        prompt = f"""
-        Act as an ATS (Applicant Tracking System).
-        Compare this Resume: {resume_text}
-        To this Job Description: {jd_text}
-
-        Give a match score out of 100%.
-        List 3 keywords missing from the resume.
-        """
-        try:
-            response = model.generate_content(prompt)
-            st.info("📊 ATS Report:")
-            st.markdown(response.text)
-        except Exception as e:
-            st.error(f"AI Error: {e}")
+    # Scored locally (skills lexicon + TF-IDF keywords): no API call, answers in milliseconds
+    start = time.perf_counter()
+    report = ats_match(resume_text, jd_text)
+    st.info("📊 ATS Report:")
+    st.markdown(format_ats_report(report))
+    st.caption(f"⚡ Scored locally in {(time.perf_counter() - start) * 1000:.0f} ms")
 
 elif fix_btn and resume_text and jd_text:
     with st.spinner("Fixing your career..."):
@@ -119,8 +118,8 @@ elif fix_btn and resume_text and jd_text:
         Use numbers, metrics, and action verbs. Make it sound like a 'Top 1% Operator'.
         """
         try:
-            response = model.generate_content(prompt)
+            result = generate_text(model, prompt, use_cache=not regenerate)
             st.success("✨ Improved Bullet Points:")
-            st.markdown(response.text)
+            st.markdown(result)
         except Exception as e:
             st.error(f"AI Error: {e}")
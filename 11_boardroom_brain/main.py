@@ -1,6 +1,15 @@
 import streamlit as st
 import google.generativeai as genai
-from pypdf import PdfReader
+import os
+import sys
+
+# Shared helpers live in growth_ops/ at the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from growth_ops.models import get_model
+from growth_ops.streaming import stream_markdown, latency_caption
+from growth_ops.retrieval import BM25Index, chunk_pages, format_context, TOP_K
+from growth_ops.extract_cache import cached_extract, content_hash, extract_cache_stats
+from growth_ops.ingest import extract_pdf_document, truncation_warning, DocumentTooLarge
 
 # --- 1. CONFIG ---
 st.set_page_config(page_title="Boardroom Brain", page_icon="🧠", layout="wide")
@@ -26,38 +35,45 @@ with st.sidebar:
     uploaded_file = st.file_uploader("Upload Report/Deck", type=['pdf'])
 
 # --- 3. THE "BRAIN" (PDF PROCESSING) ---
-def get_pdf_text(pdf_file):
-    reader = PdfReader(pdf_file)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text()
-    return text
-
-def ask_gemini(question, context):
-    # --- 1. AUTO-DETECT AVAILABLE MODELS ---
-    available_models = []
-    # Ask the API: "What models can I actually use?"
-    for m in genai.list_models():
-        if 'generateContent' in m.supported_generation_methods:
-            available_models.append(m.name)
-    
-    if not available_models:
-        return "❌ Error: Your API Key does not have access to any generation models."
+def get_pdf_pages(data):
+    # One string per page, so answers can cite page numbers. Parsed once per document
+    # (keyed by SHA-256) along with its page count; every later chat message is a cache hit
+    document = cached_extract(data, extract_pdf_document, kind="pdf-document")
+    warning = truncation_warning(document)
+    if warning:
+        st.warning(f"⚠️ {warning}")
+    return document["pages"]
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def build_index(doc_hash, _pages):
+    return BM25Index(chunk_pages(_pages))
 
-    # --- 2. SELECT THE BEST MODEL ---
+def retrieve_context(index, question):
+    # Short docs fit in the prompt whole; long ones send only the top-k BM25 chunks
+    if len(index.chunks) <= TOP_K:
+        hits = index.chunks
+    else:
+        hits = index.search(question, TOP_K) or index.chunks[:TOP_K]
+    return format_context(hits), sorted({hit["page"] for hit in hits})
+
+def chat_bubble(role, text):
+    div_class = "user-msg" if role == "user" else "bot-msg"
+    return f"<div class='chat-msg {div_class}'><strong>{role.upper()}:</strong> {text}</div>"
+
+def ask_gemini(question, context, placeholder):
+    # --- 1. SELECT THE BEST MODEL (cached per API key) ---
     # Priority: Flash (Fast) -> Pro (Smart) -> First available
-    model_name = next((m for m in available_models if 'flash' in m), None)
-    if not model_name:
-        model_name = next((m for m in available_models if 'pro' in m), available_models[0])
+    model_name, model = get_model(api_key)
+    if model is None:
+        return "❌ Error: Your API Key does not have access to any generation models.", None
 
-    # --- 3. GENERATE ---
-    model = genai.GenerativeModel(model_name)
+    # --- 2. GENERATE (streamed into the chat bubble) ---
     
     prompt = f"""
     You are a high-level Strategic Advisor to a CEO.
-    I have given you a document to analyze.
+    I have given you the most relevant excerpts of a document, each tagged with its page.
     
-    DOCUMENT CONTEXT:
+    DOCUMENT EXCERPTS:
     {context}
     
     USER QUESTION:
@@ -65,15 +81,17 @@ def ask_gemini(question, context):
     
     INSTRUCTIONS:
     - Answer based ONLY on the document provided.
+    - Cite the pages you used, like (p. 12).
     - Be concise, professional, and insight-driven.
     - If the answer isn't in the doc, say "The document does not cover this."
     """
     
+    header = f"**⚡ Utilizing Model:** `{model_name}`\n\n"
     try:
-        response = model.generate_content(prompt)
-        return f"**⚡ Utilizing Model:** `{model_name}`\n\n" + response.text
+        text, timings = stream_markdown(placeholder, model, prompt, wrap=lambda t: chat_bubble("bot", header + t))
+        return header + text, timings
     except Exception as e:
-        return f"⚠️ Model Error: {e}"
+        return f"⚠️ Model Error: {e}", None
 
 # --- 4. THE UI ---
 st.title("🧠 The Boardroom Brain")
@@ -84,10 +102,19 @@ if "history" not in st.session_state:
     st.session_state.history = []
 
 if uploaded_file and api_key:
-    # A. Extract Text
+    # A. Extract Text & build the retrieval index (cached per file)
     with st.spinner("Extracting Knowledge Graph..."):
-        raw_text = get_pdf_text(uploaded_file)
-        st.success(f"Document Indexed: {len(raw_text)} characters loaded.")
+        data = uploaded_file.getvalue()
+        try:
+            pages = get_pdf_pages(data)
+        except DocumentTooLarge as e:
+            st.error(f"❌ {e}")
+            st.stop()
+        index = build_index(content_hash(data), pages)
+        doc_chars = sum(len(page) for page in pages)
+        st.success(f"Document Indexed: {len(pages)} pages, {len(index.chunks)} passages, {doc_chars:,} characters.")
+        stats = extract_cache_stats()
+        st.caption(f"📄 PDF cache: {stats['memory_hits'] + stats['disk_hits']} hits / {stats['misses']} misses")
 
     # B. Chat Interface
     query = st.chat_input("Ask a strategic question about this document...")
@@ -95,16 +122,22 @@ if uploaded_file and api_key:
     if query:
         # Add user query to history
         st.session_state.history.append({"role": "user", "text": query})
-        
-        # Get Answer
-        with st.spinner("Analyzing..."):
-            answer = ask_gemini(query, raw_text)
-            st.session_state.history.append({"role": "bot", "text": answer})
 
     # C. Display Chat
     for chat in st.session_state.history:
-        div_class = "user-msg" if chat["role"] == "user" else "bot-msg"
-        st.markdown(f"<div class='chat-msg {div_class}'><strong>{chat['role'].upper()}:</strong> {chat['text']}</div>", unsafe_allow_html=True)
+        st.markdown(chat_bubble(chat["role"], chat["text"]), unsafe_allow_html=True)
+
+    # D. Stream the answer in below the question
+    if query:
+        with st.spinner("Analyzing..."):
+            context, cited_pages = retrieve_context(index, query)
+            output = st.empty()
+            answer, timings = ask_gemini(query, context, output)
+            output.markdown(chat_bubble("bot", answer), unsafe_allow_html=True)
+            st.session_state.history.append({"role": "bot", "text": answer})
+        st.caption(f"📎 Context: pages {', '.join(map(str, cited_pages))} · {len(context):,} of {doc_chars:,} characters sent")
+        if timings:
+            st.caption(latency_caption(timings))
 
 elif not uploaded_file:
     st.markdown("### 🛑 No Data Detected")
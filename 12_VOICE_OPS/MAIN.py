@@ -1,6 +1,13 @@
 import streamlit as st
 import google.generativeai as genai
 import json
+import os
+import sys
+
+# Shared helpers live in growth_ops/ at the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from growth_ops.models import get_model
+from growth_ops.llm_cache import generate_text
 
 # --- 1. CONFIG ---
 st.set_page_config(page_title="Voice Ops Agent", page_icon="🎙️", layout="centered")
@@ -23,24 +30,18 @@ with st.sidebar:
     st.info("Record a voice note about a meeting. The AI will structure it and draft a follow-up.")
 
 # --- 3. THE BRAIN (AUDIO PROCESSING) ---
-def process_audio(audio_file):
-    # 1. AUTO-DETECT AVAILABLE MODELS
-    # We ask the API key what it is allowed to use
-    available_models = []
-    for m in genai.list_models():
-        if 'generateContent' in m.supported_generation_methods:
-            available_models.append(m.name)
-            
-    if not available_models:
-        return '{"error": "No models found"}'
+def parse_response(text):
+    # Clean up JSON (remove markdown ticks if present)
+    return json.loads(text.replace("```json", "").replace("```", ""))
 
-    # 2. SELECT BEST MODEL (Flash is best for audio, but we fallback if needed)
-    model_name = next((m for m in available_models if 'flash' in m), None)
-    if not model_name:
-        model_name = next((m for m in available_models if 'pro' in m), available_models[0])
+def process_audio(audio_file, use_cache=True):
+    # 1. SELECT BEST MODEL (Flash is best for audio, but we fallback if needed)
+    # The pick is cached per API key, so there's no list_models() call per recording
+    model_name, model = get_model(api_key)
+    if model is None:
+        return '{"error": "No models found"}'
 
-    # 3. GENERATE
-    model = genai.GenerativeModel(model_name)
+    # 2. GENERATE
     
     prompt = """
     You are a Chief of Staff. Listen to this voice note.
@@ -64,12 +65,10 @@ def process_audio(audio_file):
     Return ONLY valid JSON. Do not use Markdown formatting like ```json.
     """
     
-    response = model.generate_content([prompt, {"mime_type": "audio/wav", "data": audio_file.getvalue()}])
-    return response.text
-    
     # Pass the audio bytes directly to Gemini
-    response = model.generate_content([prompt, {"mime_type": "audio/wav", "data": audio_file.getvalue()}])
-    return response.text
+    # Only answers that parse as JSON are cached; a malformed one is retried on the next recording
+    return generate_text(model, [prompt, {"mime_type": "audio/wav", "data": audio_file.getvalue()}],
+                         use_cache=use_cache, validate=parse_response)
 
 # --- 4. THE UI ---
 st.title("🎙️ Voice-to-CRM Agent")
@@ -77,16 +76,14 @@ st.caption("Don't type. Just talk. AI handles the admin.")
 
 # The Audio Recorder Widget
 audio_value = st.audio_input("Record your meeting notes")
+regenerate = st.checkbox("🔄 Regenerate (skip the cached answer)")
 
 if audio_value and api_key:
     with st.spinner("🎧 Listening and processing..."):
         try:
             # Get raw text response
-            raw_response = process_audio(audio_value)
-            
-            # Clean up JSON (remove markdown ticks if present)
-            clean_json = raw_response.replace("```json", "").replace("```", "")
-            data = json.loads(clean_json)
+            raw_response = process_audio(audio_value, use_cache=not regenerate)
+            data = parse_response(raw_response)
             
             crm = data['crm_data']
             email = data['email_draft']
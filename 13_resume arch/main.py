@@ -1,6 +1,17 @@
 import streamlit as st
 import google.generativeai as genai
-from pypdf import PdfReader
+import os
+import sys
+import time
+import pandas as pd
+
+# Shared helpers live in growth_ops/ at the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from growth_ops.models import get_model
+from growth_ops.streaming import stream_markdown, latency_caption
+from growth_ops.extract_cache import cached_extract, extract_cache_stats
+from growth_ops.ingest import extract_pdf_pages
+from growth_ops.ats import ats_match, format_ats_report, similarity_matrix, rank_pairs
 
 # --- 1. CONFIG ---
 st.set_page_config(page_title="Resume Architect", page_icon="👔", layout="wide")
@@ -24,17 +35,40 @@ with st.sidebar:
 
 # --- 3. THE BRAIN ---
 def get_pdf_text(pdf_file):
-    reader = PdfReader(pdf_file)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text()
-    return text
-
-def analyze_resume(resume_text, jd_text):
-    # Auto-detect model
-    available_models = [m.name for m in genai.list_models() if 'generateContent' in m.supported_generation_methods]
-    model_name = next((m for m in available_models if 'flash' in m), available_models[0])
-    model = genai.GenerativeModel(model_name)
+    # The master resume is parsed once; later clicks hit the extraction cache (keyed by SHA-256)
+    return "\n".join(cached_extract(pdf_file.getvalue(), extract_pdf_pages, kind="pdf-pages"))
+
+# Column names a JD export usually uses; the first match wins
+JD_TEXT_COLUMNS = ("description", "job_description", "jd", "text", "body")
+JD_TITLE_COLUMNS = ("title", "job_title", "role", "position")
+
+def load_jds(jd_files):
+    # One CSV row or one .txt/.md file per job posting -> [(title, text), ...]
+    jds = []
+    for jd_file in jd_files:
+        if jd_file.name.lower().endswith(".csv"):
+            df = pd.read_csv(jd_file)
+            columns = {c.lower().strip(): c for c in df.columns}
+            text_col = next((columns[c] for c in JD_TEXT_COLUMNS if c in columns), None)
+            if text_col is None:
+                # Fall back to the wordiest column
+                text_col = df.astype(str).apply(lambda col: col.str.len().mean()).idxmax()
+            title_col = next((columns[c] for c in JD_TITLE_COLUMNS if c in columns), None)
+            company_col = columns.get("company")
+            for i, row in df.iterrows():
+                title = str(row[title_col]) if title_col else f"{jd_file.name} #{i + 1}"
+                if company_col:
+                    title = f"{title} @ {row[company_col]}"
+                jds.append((title, str(row[text_col])))
+        else:
+            jds.append((jd_file.name, jd_file.getvalue().decode("utf-8", errors="ignore")))
+    return [(title, text) for title, text in jds if text.strip() and text != "nan"]
+
+def analyze_resume(resume_text, jd_text, placeholder, gaps=()):
+    # Score and missing keywords come from the local ATS engine; the model only rewrites
+    model_name, model = get_model(api_key, preferences=("flash",))
+    if model is None:
+        return "Error: Your API Key has no access to generation models.", None
 
     prompt = f"""
     You are an expert ATS (Applicant Tracking System) and Career Coach.
@@ -45,19 +79,14 @@ def analyze_resume(resume_text, jd_text):
     JOB DESCRIPTION (JD):
     {jd_text}
     
+    MISSING KEYWORDS (from the JD, not on the resume):
+    {", ".join(gaps) or "None"}
+    
     TASK:
-    1. **Match Score**: Give a strict score (0-100%) on how well the resume fits the JD.
-    2. **Missing Keywords**: List the top 3-5 hard skills/tools in the JD that are missing from the resume.
-    3. **Tailored Summary**: WRITE a new "Professional Summary" (3-4 lines) for this candidate that specifically targets this JD. Use the missing keywords naturally.
-    4. **Bullet Point Remix**: Choose 2 existing bullet points from the resume and REWRITE them to sound more like the JD (using "Action-Result" format).
+    1. **Tailored Summary**: WRITE a new "Professional Summary" (3-4 lines) for this candidate that specifically targets this JD. Use the missing keywords naturally.
+    2. **Bullet Point Remix**: Choose 2 existing bullet points from the resume and REWRITE them to sound more like the JD (using "Action-Result" format).
 
     OUTPUT FORMAT (Markdown):
-    ## 📊 Match Score: [Score]%
-    
-    ### 🛑 Missing Keywords
-    * [Keyword 1]
-    * [Keyword 2]
-    
     ### 📝 Tailored Summary (Copy-Paste this)
     > [New Summary]
     
@@ -69,8 +98,7 @@ def analyze_resume(resume_text, jd_text):
     **🚀 New Version:** [Rewritten bullet]
     """
     
-    response = model.generate_content(prompt)
-    return response.text
+    return stream_markdown(placeholder, model, prompt)
 
 # --- 4. THE UI ---
 st.title("👔 Resume Architect")
@@ -93,11 +121,22 @@ with col2:
                 # 1. Extract Text
                 resume_text = get_pdf_text(uploaded_resume)
                 
-                # 2. Analyze
-                result = analyze_resume(resume_text, jd_text)
+                # 2. Score locally (milliseconds, no API call)
+                start = time.perf_counter()
+                report = ats_match(resume_text, jd_text)
+                st.markdown(format_ats_report(report))
+                st.caption(f"⚡ ATS score computed locally in {(time.perf_counter() - start) * 1000:.0f} ms")
+                
+                # 3. Rewrite (rendered as it streams in)
+                output = st.empty()
+                result, timings = analyze_resume(resume_text, jd_text, output, report["missing_skills"] + report["missing_keywords"])
                 
-                # 3. Render
-                st.markdown(result)
+                # 4. Render
+                output.markdown(result)
+                if timings:
+                    st.caption(latency_caption(timings))
+                stats = extract_cache_stats()
+                st.caption(f"📄 PDF cache: {stats['memory_hits'] + stats['disk_hits']} hits / {stats['misses']} misses")
                 st.success("Optimization Complete.")
                 
             except Exception as e:
@@ -106,3 +145,69 @@ with col2:
         st.warning("⚠️ Enter API Key in sidebar.")
     elif analyze_btn:
         st.info("⚠️ Please upload a resume and paste a JD.")
+
+# --- 5. BATCH SCREENING ---
+st.divider()
+st.subheader("📦 Batch Screening: Many Resumes × Many JDs")
+st.caption("Every pair is scored locally in one pass. Only the top matches go to the AI for tailoring.")
+
+bcol1, bcol2 = st.columns([1, 1])
+with bcol1:
+    batch_resumes = st.file_uploader("Master Resumes (PDF)", type=['pdf'], accept_multiple_files=True, key="batch_resumes")
+with bcol2:
+    batch_jds = st.file_uploader("Job Descriptions (CSV, or one .txt per JD)", type=['csv', 'txt', 'md'], accept_multiple_files=True, key="batch_jds")
+
+top_n = st.number_input("Tailor the top N pairs", min_value=1, max_value=20, value=3)
+score_btn = st.button("📊 SCORE ALL PAIRS")
+
+if score_btn and batch_resumes and batch_jds:
+    with st.spinner("Vectorizing and scoring every pair..."):
+        start = time.perf_counter()
+        # One encrypted, corrupt or oversized PDF is skipped, not the whole batch
+        resumes, failed = [], []
+        for f in batch_resumes:
+            try:
+                resumes.append((f.name, get_pdf_text(f)))
+            except Exception as e:
+                failed.append(f"{f.name}: {e}")
+        if resumes:
+            jds = load_jds(batch_jds)
+            scores = similarity_matrix([text for _, text in resumes], [text for _, text in jds])
+            ranked = rank_pairs(scores)
+            st.session_state.batch = {"resumes": resumes, "jds": jds, "ranked": ranked, "failed": failed,
+                                      "elapsed": time.perf_counter() - start}
+        else:
+            st.session_state.pop("batch", None)
+            st.error("❌ None of the resumes could be read:\n" + "\n".join(f"* {failure}" for failure in failed))
+elif score_btn:
+    st.info("⚠️ Please upload at least one resume and one JD file.")
+
+if "batch" in st.session_state:
+    batch = st.session_state.batch
+    resumes, jds, ranked = batch["resumes"], batch["jds"], batch["ranked"]
+    if batch["failed"]:
+        with st.expander(f"⚠️ {len(batch['failed'])} resumes skipped (could not be read)"):
+            st.write("\n".join(f"* {failure}" for failure in batch["failed"]))
+    table = pd.DataFrame([
+        {"Rank": rank, "Resume": resumes[r][0], "Job": jds[j][0], "Similarity": round(100 * score, 1)}
+        for rank, (r, j, score) in enumerate(ranked, start=1)
+    ])
+    st.caption(f"⚡ {len(resumes)} resumes × {len(jds)} JDs = {len(ranked):,} pairs scored in {batch['elapsed'] * 1000:.0f} ms")
+    st.dataframe(table.head(100), use_container_width=True, hide_index=True)
+    st.download_button("📥 Download full ranking (CSV)", table.to_csv(index=False), "resume_jd_matches.csv", "text/csv")
+
+    if st.button(f"✨ TAILOR TOP {top_n} PAIRS", type="primary"):
+        if not api_key:
+            st.warning("⚠️ Enter API Key in sidebar.")
+        else:
+            # The expensive step only runs for the best matches
+            for rank, (r, j, score) in enumerate(ranked[:top_n], start=1):
+                (resume_name, resume_text), (job_title, jd_text) = resumes[r], jds[j]
+                with st.expander(f"#{rank} · {resume_name} → {job_title} ({100 * score:.0f}%)", expanded=rank == 1):
+                    report = ats_match(resume_text, jd_text)
+                    st.markdown(format_ats_report(report))
+                    output = st.empty()
+                    result, timings = analyze_resume(resume_text, jd_text, output, report["missing_skills"] + report["missing_keywords"])
+                    output.markdown(result)
+                    if timings:
+                        st.caption(latency_caption(timings))
@@ -1,6 +1,15 @@
 import streamlit as st
 import google.generativeai as genai
-from pypdf import PdfReader
+import os
+import sys
+
+# Shared helpers live in growth_ops/ at the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from growth_ops.models import get_model
+from growth_ops.streaming import stream_markdown, latency_caption
+from growth_ops.ingest import extract_pdf_document, truncation_warning, DocumentTooLarge
+from growth_ops.extract_cache import cached_extract, content_hash
+from growth_ops.corpus_index import CorpusIndex, format_corpus_context
 
 # --- 1. CONFIG ---
 st.set_page_config(page_title="DocuMind", page_icon="📄", layout="centered")
@@ -22,73 +31,111 @@ with st.sidebar:
     if api_key:
         genai.configure(api_key=api_key)
     
-    st.info("Upload a PDF. Chat with it.")
-    uploaded_file = st.file_uploader("Choose a PDF", type="pdf")
+    st.info("Upload PDFs. Chat with your whole library.")
+    uploaded_files = st.file_uploader("Choose PDFs", type="pdf", accept_multiple_files=True)
 
 # --- 3. SESSION STATE (Memory) ---
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = []
-if "pdf_text" not in st.session_state:
-    st.session_state.pdf_text = ""
-
-# --- 4. LOGIC (Extract & Generate) ---
-def get_pdf_text(pdf_file):
-    reader = PdfReader(pdf_file)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text()
-    return text
-
-def ask_gemini(query, context):
-    # --- AUTO-DETECT MODEL FIX ---
-    available_models = [m.name for m in genai.list_models() if 'generateContent' in m.supported_generation_methods]
+
+# --- 4. LOGIC (Index & Generate) ---
+@st.cache_resource
+def load_corpus():
+    # Memory-mapped from disk once per server; documents indexed in earlier sessions are still there
+    return CorpusIndex()
+
+def index_pdf(corpus, name, data, doc_hash):
+    # Appended to the on-disk index; nothing already indexed is rewritten
+    document = cached_extract(data, extract_pdf_document, kind="pdf-document")
+    warning = truncation_warning(document)
+    if warning:
+        st.warning(f"⚠️ {name}: {warning}")
+    return corpus.add_document(name, doc_hash, document["pages"])
+
+def chat_bubble(role, message):
+    css_class = "user-msg" if role == "User" else "ai-msg"
+    return f"<div class='chat-msg {css_class}'><strong>{role}:</strong> {message}</div>"
+
+def ask_gemini(query, context, placeholder):
+    # --- AUTO-DETECT MODEL (cached per API key) ---
     # Priority: Flash -> Pro -> First Available
-    model_name = next((m for m in available_models if 'flash' in m), None)
-    if not model_name:
-        model_name = next((m for m in available_models if 'pro' in m), available_models[0])
-    
-    model = genai.GenerativeModel(model_name)
+    model_name, model = get_model(api_key)
+    if model is None:
+        return "Error: Your API Key has no access to generation models.", None
     # -----------------------------
     
     prompt = f"""
-    You are a helpful Research Assistant. Answer the question based ONLY on the document provided.
+    You are a helpful Research Assistant. Answer the question based ONLY on the documents provided.
     
-    DOCUMENT CONTEXT:
-    {context[:30000]} # Limit context to save tokens
+    DOCUMENT CONTEXT (the most relevant passages, tagged with their source and page):
+    {context}
     
     USER QUESTION:
     {query}
     
-    Answer clearly and concisely.
+    Answer clearly and concisely, and cite the [document, page] you used.
     """
-    response = model.generate_content(prompt)
-    return response.text
+    return stream_markdown(placeholder, model, prompt, wrap=lambda t: chat_bubble("AI", t))
 
 # --- 5. UI ---
 st.title("📄 DocuMind: Chat with PDF")
+corpus = load_corpus()
+
+# A. Index new PDFs (only once per document, ever)
+for pdf_file in uploaded_files or []:
+    data = pdf_file.getvalue()
+    doc_hash = content_hash(data)
+    if not corpus.has_document(doc_hash):
+        try:
+            with st.spinner(f"Indexing {pdf_file.name}..."):
+                doc = index_pdf(corpus, pdf_file.name, data, doc_hash)
+        except DocumentTooLarge as e:
+            st.error(f"❌ {pdf_file.name}: {e}")
+            continue
+        st.success(f"{doc['name']} indexed: {doc['pages']} pages, {doc['chunks']} passages.")
+
+with st.sidebar:
+    if corpus.documents:
+        st.caption(f"📚 Library: {len(corpus.documents)} documents · {len(corpus):,} passages")
+        for doc in corpus.documents:
+            st.caption(f"• {doc['name']} ({doc['pages']} pages)")
+        # The library is shared by everyone using this server, so clearing it takes a confirmation
+        confirm_clear = st.checkbox("I understand this clears the library for every user")
+        if st.button("🗑️ Clear library", disabled=not confirm_clear):
+            corpus.clear()
+            st.session_state.chat_history = []
+            st.rerun()
 
-if uploaded_file:
-    # A. Process PDF (Only once)
-    if st.session_state.pdf_text == "":
-        with st.spinner("Reading document..."):
-            st.session_state.pdf_text = get_pdf_text(uploaded_file)
-            st.success("Document loaded! Ask me anything.")
+if corpus.documents:
 
     # B. Chat History Display
     for role, message in st.session_state.chat_history:
-        css_class = "user-msg" if role == "User" else "ai-msg"
-        st.markdown(f"<div class='chat-msg {css_class}'><strong>{role}:</strong> {message}</div>", unsafe_allow_html=True)
+        st.markdown(chat_bubble(role, message), unsafe_allow_html=True)
+    if "last_sources" in st.session_state:
+        st.caption(st.session_state.pop("last_sources"))
+    if "last_timings" in st.session_state:
+        st.caption(latency_caption(st.session_state.pop("last_timings")))
 
     # C. Input Area
-    user_query = st.chat_input("Ask about the document...")
+    user_query = st.chat_input("Ask about your documents...")
     
     if user_query and api_key:
         # 1. Append User Msg
         st.session_state.chat_history.append(("User", user_query))
         
-        # 2. Get Answer
+        # 2. Get Answer (streamed in below the question)
+        st.markdown(chat_bubble("User", user_query), unsafe_allow_html=True)
         with st.spinner("Thinking..."):
-            answer = ask_gemini(user_query, st.session_state.pdf_text)
+            # Cosine top-k over every passage of every indexed document
+            hits = corpus.search(user_query)
+            context = format_corpus_context(hits)
+            answer, timings = ask_gemini(user_query, context, st.empty())
+        sources = sorted({(hit["name"], hit["page"]) for hit in hits})
+        st.session_state.last_sources = (
+            f"📎 Sources: {', '.join(f'{name} p.{page}' for name, page in sources)} · {len(context):,} characters sent"
+            if hits else "📎 No matching passages found in the library.")
+        if timings:
+            st.session_state.last_timings = timings
         
         # 3. Append AI Msg
         st.session_state.chat_history.append(("AI", answer))
@@ -96,5 +143,5 @@ if uploaded_file:
         # 4. Refresh to show new message
         st.rerun()
 
-elif not uploaded_file:
+else:
     st.info("Waiting for PDF upload...")
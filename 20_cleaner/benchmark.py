@@ -0,0 +1,58 @@
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+from main import is_valid_email, title_case_names, lowercase_emails, normalize_phones, validate_emails
+
+# --- PART 1: SYNTHETIC CRM EXPORT ---
+# Usage: python benchmark.py [rows ...]   (defaults to 1M and 10M rows)
+def build_leads(rows, seed=7):
+    rng = np.random.default_rng(seed)
+    ids = rng.integers(0, rows, size=rows).astype(str)
+    emails = pd.Series(ids).radd("lead").add("@company.com")
+    emails[rng.random(rows) < 0.05] = "broken@"  # ~5% invalid
+    return pd.DataFrame({
+        "Full Name": pd.Series(ids).radd("  john doe "),
+        "Email Address": emails,
+        "Phone": pd.Series(rng.integers(10**9, 10**10, size=rows).astype(str)).str.replace(r"(\d{3})(\d{3})(\d{4})", r"\1-\2-\3", regex=True),
+    })
+
+# --- PART 2: THE TWO PATHS ---
+def apply_path(df):
+    # The original row-by-row logic: title-case, then is_valid_email via .apply() twice
+    df["Full Name"] = df["Full Name"].str.strip().str.title()
+    bad_emails = df[~df["Email Address"].apply(is_valid_email)]
+    if not bad_emails.empty:
+        df = df[df["Email Address"].apply(is_valid_email)]
+    return df
+
+def vectorized_path(df):
+    return validate_emails(title_case_names(df))
+
+def timed(fn, df):
+    start = time.perf_counter()
+    result = fn(df)
+    return result, time.perf_counter() - start
+
+# --- EXECUTION ---
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [1_000_000, 10_000_000]
+
+    for rows in sizes:
+        print(f"🧪 Building {rows:,} leads...")
+        df = build_leads(rows)
+
+        old_df, old_time = timed(apply_path, df.copy())
+        new_df, new_time = timed(vectorized_path, df.copy())
+        assert old_df.equals(new_df), "vectorized path diverged from the apply path"
+
+        # The opt-in stages, for reference
+        _, extra_time = timed(lambda d: normalize_phones(lowercase_emails(d)), df.copy())
+
+        print("-------------------------------")
+        print(f"🐢 apply() path      : {old_time:.2f}s")
+        print(f"⚡ Vectorized stages : {new_time:.2f}s")
+        print(f"🚀 Speedup           : {old_time / new_time:.2f}x")
+        print(f"📞 + lowercase & E.164 phones: {extra_time:.2f}s")
+        print("-------------------------------")
@@ -1,6 +1,10 @@
 import pandas as pd
+import numpy as np
 import re
 import os
+import difflib
+import sqlite3
+import tempfile
 
 # --- PART 1: GENERATE DUMMY DATA (For Testing) ---
 # We create a messy file to simulate a bad export from a tool
@@ -14,49 +18,334 @@ def create_messy_file(filename="messy_leads.csv"):
     df.to_csv(filename, index=False)
     print(f"⚠️  Created '{filename}' with messy data for testing.\n")
 
-# --- PART 2: THE CLEANING LOGIC ---
+# --- PART 2: THE CLEANING RULES (Vectorized) ---
+# Patterns are compiled once and every stage works on a whole column at a time,
+# so a 10M-row export never drops into a Python-level loop.
 
-def clean_leads(input_file, output_file):
-    print(f"🧹 Starting cleanup on {input_file}...")
-    
-    # 1. Load the Data
-    try:
-        df = pd.read_csv(input_file)
-    except FileNotFoundError:
-        print("Error: File not found!")
-        return
+# Basic check: Must have characters + @ + characters + . + characters
+EMAIL_PATTERN = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w+$')
+
+# Country code assumed for 10-digit local numbers like "555.123.4567"
+DEFAULT_COUNTRY_CODE = "1"
+
+def is_valid_email(email):
+    return EMAIL_PATTERN.match(str(email)) is not None
 
-    # 2. Standardization (Title Casing Names)
+def title_case_names(df):
     # Converts "john doe" -> "John Doe" and "SARAH SMITH" -> "Sarah Smith"
     if "Full Name" in df.columns:
         df["Full Name"] = df["Full Name"].str.strip().str.title()
-        print("✅ Names standardized to Title Case.")
+    return df
 
-    # 3. Deduplication
+def lowercase_emails(df):
+    # "JOHN@Gmail.com " -> "john@gmail.com" (run before dedupe_emails to catch case-only duplicates)
+    if "Email Address" in df.columns:
+        df["Email Address"] = df["Email Address"].str.strip().str.lower()
+    return df
+
+def normalize_phones(df, country_code=DEFAULT_COUNTRY_CODE):
+    # "555.123.4567" -> "+15551234567", "+91 98765 43210" -> "+919876543210", "N/A" -> blank
+    if "Phone" not in df.columns:
+        return df
+    raw = df["Phone"].astype(str).str.strip()
+    digits = raw.str.replace(r"\D", "", regex=True)
+    has_plus = raw.str.startswith("+", na=False)
+    has_00 = ~has_plus & digits.str.startswith("00", na=False)
+    digits = digits.where(~has_00, digits.str[2:])
+    n_digits = digits.str.len()
+    no_prefix = ~(has_plus | has_00)
+    is_local = no_prefix & (n_digits == 10)
+    has_country = no_prefix & (n_digits == 10 + len(country_code)) & digits.str.startswith(country_code, na=False)
+
+    e164 = "+" + digits.where(~is_local, country_code + digits)
+    # E.164 allows at most 15 digits; anything shorter than 8 is not a real number
+    valid = (has_plus | has_00 | is_local | has_country) & n_digits.between(8, 15)
+    df["Phone"] = e164.where(valid)
+    return df
+
+def dedupe_emails(df):
     # Removes rows where the Email Address is exactly the same
-    initial_count = len(df)
     if "Email Address" in df.columns:
-        df.drop_duplicates(subset=["Email Address"], keep="first", inplace=True)
-        print(f"✅ Removed {initial_count - len(df)} duplicate rows.")
+        df = df.drop_duplicates(subset=["Email Address"], keep="first")
+    return df
 
-    # 4. Email Validation (Regex)
-    # Basic check: Must have characters + @ + characters + . + characters
-    def is_valid_email(email):
-        pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
-        return re.match(pattern, str(email)) is not None
+def validate_emails(df):
+    if "Email Address" in df.columns:
+        df = df[df["Email Address"].astype(str).str.match(EMAIL_PATTERN, na=False)]
+    return df
 
+# --- Fuzzy duplicates ("john doe / john@gmail.com" vs "John  Doe / JOHN@gmail.com") ---
+# Blocking: only rows that share a blocking key (normalized email or phone digits) are
+# ever compared, so the work grows with the number of near-duplicates, not rows².
+FUZZY_THRESHOLD = 0.85   # name similarity (0-1) needed to merge two rows in a block
+MAX_BLOCK_PAIRS = 100    # blocks with more pairs than this fall back to a sorted-neighbourhood scan
+SORTED_WINDOW = 10       # in that scan, each row is compared with the next N rows in name order
+
+def _normalized_names(df):
+    if "Full Name" not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    return df["Full Name"].str.lower().str.replace(r"[^a-z ]", "", regex=True).str.split().str.join(" ")
+
+def _blocking_keys(df):
+    keys = []
     if "Email Address" in df.columns:
-        # Create a separate file for bad emails (optional but good practice)
-        bad_emails = df[~df["Email Address"].apply(is_valid_email)]
-        if not bad_emails.empty:
-            print(f"⚠️  Found {len(bad_emails)} invalid emails. Removing them...")
-            df = df[df["Email Address"].apply(is_valid_email)]
-
-    # 5. Export
-    df.to_csv(output_file, index=False)
+        # "J.Doe+crm@Gmail.com" -> "jdoe@gmail.com"
+        parts = df["Email Address"].str.strip().str.lower().str.extract(r"^([^@+]+)(?:\+[^@]*)?@(.+)$")
+        keys.append(parts[0].str.replace(".", "", regex=False) + "@" + parts[1])
+    if "Phone" in df.columns:
+        # Last 10 digits, so "+1 555-123-4567" and "555.123.4567" land in the same block
+        digits = df["Phone"].astype(str).str.replace(r"\D", "", regex=True).str[-10:]
+        keys.append(digits.where(digits.str.len() == 10))
+    return keys
+
+def _blocks(key):
+    """Yields arrays of row positions that share a key (singletons are skipped)."""
+    key = key.reset_index(drop=True)
+    shared = key.notna() & key.duplicated(keep=False)
+    positions = np.flatnonzero(shared.to_numpy())
+    if len(positions) == 0:
+        return
+    codes = pd.factorize(key[shared])[0]
+    order = np.argsort(codes, kind="stable")
+    positions, codes = positions[order], codes[order]
+    yield from np.split(positions, np.flatnonzero(np.diff(codes)) + 1)
+
+def _block_pairs(block, names):
+    """Yields the row pairs worth comparing inside one block."""
+    if len(block) * (len(block) - 1) // 2 <= MAX_BLOCK_PAIRS:
+        yield from ((i, j) for n, i in enumerate(block) for j in block[n + 1:])
+        return
+    # Too big for every pair: sort by normalized name so near-duplicates ("jon doe" / "john doe")
+    # sit close together, and compare each row only with its next few neighbours
+    named = sorted((i for i in block if isinstance(names[i], str)), key=lambda i: names[i])
+    for n, i in enumerate(named):
+        yield from ((i, j) for j in named[n + 1:n + 1 + SORTED_WINDOW])
+    # A row without a name matches anyone, so attach it to the block's first row
+    yield from ((block[0], i) for i in block[1:] if not isinstance(names[i], str))
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+def fuzzy_dedupe(df, threshold=FUZZY_THRESHOLD):
+    # Adds a "Cluster ID" column: rows with the same id are the same person
+    names = _normalized_names(df).to_numpy(dtype=object)
+    parent = np.arange(len(df))
+
+    def same_person(i, j):
+        a, b = names[i], names[j]
+        if not isinstance(a, str) or not isinstance(b, str) or a == b:
+            return True
+        return difflib.SequenceMatcher(None, a, b).ratio() >= threshold
+
+    for key in _blocking_keys(df):
+        for block in _blocks(key):
+            for i, j in _block_pairs(block, names):
+                root_i, root_j = _find(parent, i), _find(parent, j)
+                if root_i != root_j and same_person(i, j):
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    # Pointer-jump every row to its root in a few vectorized passes
+    while True:
+        roots = parent[parent]
+        if np.array_equal(roots, parent):
+            break
+        parent = roots
+    df["Cluster ID"] = pd.factorize(parent)[0]
+    return df
+
+# Every stage takes a DataFrame and returns the cleaned DataFrame
+CLEANING_STAGES = {
+    "title_case_names": title_case_names,
+    "lowercase_emails": lowercase_emails,
+    "normalize_phones": normalize_phones,
+    "dedupe_emails": dedupe_emails,
+    "validate_emails": validate_emails,
+    "fuzzy_dedupe": fuzzy_dedupe,
+}
+
+# The classic pipeline; add "lowercase_emails" / "normalize_phones" / "fuzzy_dedupe" to opt in
+DEFAULT_STAGES = ["title_case_names", "dedupe_emails", "validate_emails"]
+
+STAGE_MESSAGES = {
+    "title_case_names": "✅ Names standardized to Title Case.",
+    "lowercase_emails": "✅ Emails lower-cased.",
+    "normalize_phones": "✅ Phones normalized to E.164.",
+    "dedupe_emails": "✅ Removed {dropped} duplicate rows.",
+    "validate_emails": "⚠️  Removed {dropped} invalid emails.",
+    "fuzzy_dedupe": "✅ Fuzzy duplicates grouped into the 'Cluster ID' column.",
+}
+
+def run_stages(df, stages, overrides=None):
+    """Runs the named stages in order. Returns the frame and the rows each stage dropped."""
+    overrides = overrides or {}
+    dropped = {}
+    for name in stages:
+        stage = overrides.get(name, CLEANING_STAGES[name])
+        before = len(df)
+        df = stage(df)
+        dropped[name] = before - len(df)
+    return df, dropped
+
+def print_stage_report(stages, dropped):
+    for name in stages:
+        if name == "validate_emails" and not dropped[name]:
+            continue
+        print(STAGE_MESSAGES[name].format(dropped=dropped[name]))
+
+# --- PART 3: FILE I/O (CSV or Parquet) ---
+# Parquet keeps typed columns and skips the CSV parse; the extension picks the format.
+
+# Low-cardinality text columns stored as categoricals in Parquet
+CATEGORICAL_COLUMNS = ["Type"]
+
+# Pin the text columns to str so CSVs (and every chunk of one) parse them the same way
+TEXT_COLUMNS = {"Full Name": str, "Email Address": str, "Phone": str}
+
+def is_parquet(path):
+    return str(path).lower().endswith(".parquet")
+
+def to_categoricals(df):
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    return df
+
+def read_leads(path):
+    if is_parquet(path):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, dtype=TEXT_COLUMNS)
+
+def write_leads(df, path):
+    if is_parquet(path):
+        to_categoricals(df).to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+# --- PART 4: THE CLEANING LOGIC ---
+
+def clean_leads(input_file, output_file, chunksize=None, stages=DEFAULT_STAGES):
+    # Big exports: stream through in chunks instead of loading everything
+    if chunksize:
+        return clean_leads_chunked(input_file, output_file, chunksize, stages)
+
+    print(f"🧹 Starting cleanup on {input_file}...")
+    
+    # 1. Load the Data
+    try:
+        df = read_leads(input_file)
+    except FileNotFoundError:
+        print("Error: File not found!")
+        return
+
+    # 2. Run the rules engine (standardize, dedupe, validate)
+    df, dropped = run_stages(df, stages)
+    print_stage_report(stages, dropped)
+
+    # 3. Export
+    write_leads(df, output_file)
     print(f"\n✨ Success! Clean data saved to: {output_file}")
     print(f"📊 Final Lead Count: {len(df)}")
 
+# --- PART 5: OUT-OF-CORE MODE (Files Bigger Than RAM) ---
+# Same steps as clean_leads(), one chunk at a time. Cross-chunk dedup keeps only a
+# 64-bit hash per email in a throwaway SQLite file, so memory stays at ~1 chunk.
+
+def _new_key_store(path):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("CREATE TABLE seen (k INTEGER PRIMARY KEY)")
+    conn.execute("CREATE TEMP TABLE batch (k INTEGER PRIMARY KEY)")
+    return conn
+
+def _first_seen(conn, emails):
+    """Boolean mask: True where this email has not appeared in this or any earlier chunk."""
+    keys = pd.util.hash_pandas_object(emails.astype(str), index=False).astype("int64")
+
+    # Within the chunk: keep the first occurrence, exactly like drop_duplicates(keep="first")
+    mask = ~keys.duplicated(keep="first")
+
+    # Across chunks: look the remaining keys up in the on-disk set, then add them
+    conn.execute("DELETE FROM batch")
+    conn.executemany("INSERT INTO batch VALUES (?)", ((int(k),) for k in keys[mask]))
+    already_seen = {k for (k,) in conn.execute("SELECT k FROM batch JOIN seen USING (k)")}
+    conn.execute("INSERT OR IGNORE INTO seen SELECT k FROM batch")
+
+    if already_seen:
+        mask &= ~keys.isin(already_seen)
+    return mask
+
+def _open_chunks(path, chunksize):
+    if is_parquet(path):
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path)
+        return (batch.to_pandas() for batch in parquet_file.iter_batches(batch_size=chunksize))
+    return pd.read_csv(path, chunksize=chunksize, dtype=TEXT_COLUMNS)
+
+def _append_chunk(chunk, path, first, parquet_writer=None):
+    """Appends one chunk to path. Returns the (possibly new) ParquetWriter for Parquet output."""
+    if not is_parquet(path):
+        chunk.to_csv(path, mode="w" if first else "a", header=first, index=False)
+        return None
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    table = pa.Table.from_pandas(to_categoricals(chunk), preserve_index=False)
+    if parquet_writer is None:
+        parquet_writer = pq.ParquetWriter(path, table.schema)
+    parquet_writer.write_table(table.cast(parquet_writer.schema))
+    return parquet_writer
+
+def clean_leads_chunked(input_file, output_file, chunksize=100_000, stages=DEFAULT_STAGES):
+    print(f"🧹 Starting chunked cleanup on {input_file} ({chunksize:,} rows per chunk)...")
+
+    try:
+        reader = _open_chunks(input_file, chunksize)
+    except FileNotFoundError:
+        print("Error: File not found!")
+        return
+
+    # Fuzzy clusters need every row at once, so they only run in the in-memory path
+    if "fuzzy_dedupe" in stages:
+        print("⚠️  fuzzy_dedupe is skipped in chunked mode (it needs the whole file in memory).")
+        stages = [name for name in stages if name != "fuzzy_dedupe"]
+
+    total_rows, final_count = 0, 0
+    dropped = dict.fromkeys(stages, 0)
+    parquet_writer = None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn = _new_key_store(os.path.join(tmp_dir, "seen_emails.db"))
+
+        # Deduplication has to look at every earlier chunk too, not just this one
+        def dedupe_across_chunks(chunk):
+            if "Email Address" in chunk.columns:
+                chunk = chunk[_first_seen(conn, chunk["Email Address"])]
+            return chunk
+
+        try:
+            for i, chunk in enumerate(reader):
+                total_rows += len(chunk)
+
+                chunk, chunk_dropped = run_stages(chunk, stages, {"dedupe_emails": dedupe_across_chunks})
+                for name, count in chunk_dropped.items():
+                    dropped[name] += count
+
+                # Stream the chunk straight to disk
+                parquet_writer = _append_chunk(chunk, output_file, i == 0, parquet_writer)
+                final_count += len(chunk)
+        finally:
+            conn.close()
+            if parquet_writer is not None:
+                parquet_writer.close()
+
+    print(f"✅ Processed {total_rows} rows.")
+    print_stage_report(stages, dropped)
+    print(f"\n✨ Success! Clean data saved to: {output_file}")
+    print(f"📊 Final Lead Count: {final_count}")
+
 # --- EXECUTION ---
 if __name__ == "__main__":
     # Create the test file first
@@ -1,5 +1,12 @@
 import streamlit as st
 import google.generativeai as genai
+import os
+import sys
+
+# Shared helpers live in growth_ops/ at the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from growth_ops.models import get_model
+from growth_ops.streaming import stream_markdown, latency_caption
 
 # --- 1. CONFIG ---
 st.set_page_config(page_title="Growth Ops Engine", page_icon="🚀", layout="wide")
@@ -20,25 +27,14 @@ with st.sidebar:
         genai.configure(api_key=api_key)
 
 # --- 3. THE PROMPTS ---
-def generate_content(topic, raw_text, tone):
-    # 1. AUTO-DETECT AVAILABLE MODELS
-    # This asks your API key: "What models can I use?"
-    available_models = []
-    for m in genai.list_models():
-        if 'generateContent' in m.supported_generation_methods:
-            available_models.append(m.name)
-    
-    # 2. SELECT THE BEST ONE
+def generate_content(topic, raw_text, tone, placeholder):
+    # 1. PICK THE BEST MODEL (cached: no list_models() round trip per click)
     # Tries to find 'flash' (fastest), then 'pro', then defaults to the first one found.
-    if not available_models:
-        return "Error: Your API Key has no access to generation models."
-        
-    model_name = next((m for m in available_models if 'flash' in m), None)
-    if not model_name:
-        model_name = next((m for m in available_models if 'pro' in m), available_models[0])
+    model_name, model = get_model(api_key)
+    if model is None:
+        return "Error: Your API Key has no access to generation models.", None
     
-    # 3. GENERATE
-    model = genai.GenerativeModel(model_name)
+    # 2. GENERATE (streamed into the placeholder as it arrives)
     
     prompt = f"""
     You are a viral ghostwriter for a Tech Founder. 
@@ -58,8 +54,9 @@ def generate_content(topic, raw_text, tone):
        - Tweet 3: The takeaway.
     """
     
-    response = model.generate_content(prompt)
-    return f"**Using Model:** `{model_name}`\n\n" + response.text
+    header = f"**Using Model:** `{model_name}`\n\n"
+    text, timings = stream_markdown(placeholder, model, prompt, wrap=lambda t: header + t)
+    return header + text, timings
 
 # --- 4. UI DASHBOARD ---
 st.title("🚀 CONTENT OPS ENGINE")
@@ -79,8 +76,11 @@ with col2:
     if generate_btn and api_key and raw_text:
         with st.spinner("Refining hooks..."):
             try:
-                result = generate_content(topic, raw_text, tone)
-                st.markdown(result)
+                output = st.empty()
+                result, timings = generate_content(topic, raw_text, tone, output)
+                output.markdown(result)
+                if timings:
+                    st.caption(latency_caption(timings))
                 st.success("Assets Generated.")
             except Exception as e:
                 st.error(f"Error: {e}")
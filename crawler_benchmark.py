@@ -0,0 +1,169 @@
+import os
+import sys
+import time
+import hashlib
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from growth_ops import crawler, http_cache
+
+# --- 1. SETUP ---
+# Serves fake competitor sites from local HTTP servers (one port = one host) and compares the
+# old one-requests.get-per-URL scrape against growth_ops.crawler, then measures a repeat
+# "daily recon" run through the conditional-GET page cache.
+# Usage: python crawler_benchmark.py [--sites 20] [--pages 4] [--latency 0.2] [--delay 0.25]
+PAGES = ["pricing", "features", "blog", "about", "careers", "changelog", "docs", "customers"]
+
+
+# --- 2. FIXTURE SERVER ---
+def make_handler(latency, stats, page_kb):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like a real site
+
+        def log_message(self, *args):
+            pass
+
+        def setup(self):
+            super().setup()
+            with stats["lock"]:
+                stats["connections"] += 1
+
+        def send_body(self, body, content_type="text/html"):
+            data = body.encode("utf-8")
+            etag = '"%s"' % hashlib.md5(data).hexdigest()
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(data)
+            with stats["lock"]:
+                stats["bytes"] += len(data)
+
+        def do_GET(self):
+            host = f"http://{self.headers['Host']}"
+            if self.path == "/robots.txt":
+                return self.send_body("User-agent: *\nDisallow: /private\n", "text/plain")
+            if self.path == "/sitemap.xml":
+                locs = "".join(f"<url><loc>{host}/{page}</loc></url>" for page in PAGES)
+                return self.send_body(f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{locs}</urlset>', "application/xml")
+            time.sleep(latency)
+            with stats["lock"]:
+                stats["pages"] += 1
+            page = self.path.strip("/") or "home"
+            filler = "".join(f"<p>Feature {i}: built for growth teams, plans from $49/mo.</p>" for i in range(page_kb * 16))
+            self.send_body(f"<html><head><style>p{{}}</style></head><body><h1>{host} {page}</h1>"
+                           f"{filler}<script>track()</script></body></html>")
+    return Handler
+
+
+class QuietServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # Requests cut off by the crawl budget hang up mid-response; that's expected here
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+
+def start_sites(count, latency, page_kb=50):
+    stats = {"connections": 0, "pages": 0, "bytes": 0, "lock": threading.Lock()}
+    servers = []
+    for _ in range(count):
+        server = QuietServer(("127.0.0.1", 0), make_handler(latency, stats, page_kb))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers, stats
+
+
+# --- 3. THE TWO SCRAPERS ---
+def serial_scrape(urls):
+    # The old path: a fresh connection and a blocking request per URL
+    results = []
+    for url in urls:
+        response = requests.get(url, headers={"User-Agent": crawler.USER_AGENT}, timeout=10)
+        results.append(crawler.html_to_text(response.content))
+    return results
+
+
+def reset(stats):
+    with stats["lock"]:
+        stats["connections"] = stats["pages"] = stats["bytes"] = 0
+
+
+# --- EXECUTION ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serial scraping vs the concurrent crawler, against local fixture sites.")
+    parser.add_argument("--sites", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=4, help="pages per site (taken from its sitemap)")
+    parser.add_argument("--latency", type=float, default=0.2, help="server think time per page, seconds")
+    parser.add_argument("--delay", type=float, default=0.25, help="politeness gap per host, seconds")
+    parser.add_argument("--budget", type=float, default=60)
+    parser.add_argument("--page-kb", type=int, default=50, help="approximate page size")
+    args = parser.parse_args()
+
+    # The page cache goes to a throwaway file, not the real one
+    http_cache.HTTP_CACHE_PATH = os.path.join(tempfile.mkdtemp(), "http_pages.sqlite")
+    servers, stats = start_sites(args.sites, args.latency, args.page_kb)
+    session = crawler.make_session()
+    urls = []
+    for server in servers:
+        sitemap = f"http://127.0.0.1:{server.server_address[1]}/sitemap.xml"
+        urls += crawler.read_sitemap(session, sitemap)[:args.pages]
+    blocked = f"http://127.0.0.1:{servers[0].server_address[1]}/private/roadmap"
+    print(f"🧪 {args.sites} fixture sites × {args.pages} pages = {len(urls)} URLs, {args.latency * 1000:.0f} ms per page")
+
+    reset(stats)
+    start = time.perf_counter()
+    serial = serial_scrape(urls)
+    serial_time, serial_connections = time.perf_counter() - start, stats["connections"]
+
+    reset(stats)
+    start, first = time.perf_counter(), None
+    results = []
+    # A fresh session, so the sitemap reads above don't hand it warm connections
+    for result in crawler.crawl(urls + [blocked], session=crawler.make_session(), delay=args.delay, budget=args.budget, ttl=None):
+        first = first or time.perf_counter() - start
+        results.append(result)
+    crawl_time, crawl_connections = time.perf_counter() - start, stats["connections"]
+
+    fetched = {r["url"]: r["text"] for r in results if not r["error"]}
+    print("-------------------------------")
+    print(f"🐢 Serial requests.get : {serial_time:.2f}s, {serial_connections} connections")
+    print(f"⚡ Concurrent crawl    : {crawl_time:.2f}s, {crawl_connections} connections (incl. robots.txt)")
+    print(f"🚀 Speedup             : {serial_time / crawl_time:.2f}x")
+    print(f"⏱️ First result        : {first * 1000:.0f} ms")
+    print("-------------------------------")
+    print(f"✅ Same text: {[fetched.get(url) for url in urls] == serial} ({len(fetched)}/{len(urls)} pages)")
+    print(f"🤖 robots.txt: {next(r['error'] for r in results if r['url'] == blocked)} ({blocked})")
+
+    # A budget shorter than the crawl: whatever is left is reported as skipped, not hung on
+    tight = list(crawler.crawl(urls, session=crawler.make_session(), delay=args.delay, budget=1.0, ttl=None))
+    skipped = sum(1 for r in tight if r["error"] and "budget" in r["error"])
+    fetched_in_budget = sum(1 for r in tight if not r["error"])
+    print(f"⏳ 1s budget: {fetched_in_budget} fetched, {skipped} skipped, {len(tight) - fetched_in_budget - skipped} timed out")
+
+    # --- 4. DAILY RECON THROUGH THE PAGE CACHE ---
+    print("-------------------------------")
+    runs = [("Cold (empty cache)", 3600), ("Next day (TTL expired)", 0), ("Within TTL", 3600)]
+    for label, ttl in runs:
+        reset(stats)
+        start = time.perf_counter()
+        results = list(crawler.crawl(urls, session=crawler.make_session(), delay=args.delay, budget=args.budget, ttl=ttl))
+        outcomes = {}
+        for r in results:
+            outcomes[r["cache"]] = outcomes.get(r["cache"], 0) + 1
+        same = [r["text"] for r in sorted(results, key=lambda r: urls.index(r["url"]))] == serial
+        print(f"🗄️ {label:<24}: {time.perf_counter() - start:.2f}s, {stats['bytes'] / 1024:,.0f} KB sent, "
+              f"{stats['pages']} page requests, {outcomes} (same text: {same})")
+
+    for server in servers:
+        server.shutdown()
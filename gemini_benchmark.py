@@ -0,0 +1,155 @@
+import io
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import importlib.machinery
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# --- 1. SETUP ---
+# Drives each app's core Gemini function against the local mock (growth_ops/mock_genai.py)
+# at a given concurrency and reports latency percentiles and throughput. No API key, no quota.
+# Usage: python gemini_benchmark.py [--apps boardroom documind ...] [--requests 40] [--concurrency 8]
+#                                   [--latency 0.4] [--error-rate 0.0] [--rpm 0]
+repo_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(repo_root)
+
+# Keep the benchmark's responses out of the real LLM cache
+os.environ.setdefault("GROWTH_OPS_CACHE_DIR", tempfile.mkdtemp(prefix="gemini_bench_"))
+
+from growth_ops import mock_genai
+mock_genai.install()
+from growth_ops import streaming, telemetry
+from growth_ops.retrieval import BM25Index, chunk_pages, format_context
+
+
+class NullPlaceholder:
+    # Stands in for st.empty() so streamed apps render nowhere
+    def markdown(self, *args, **kwargs):
+        pass
+
+
+class FakeAudio(io.BytesIO):
+    name = "note.wav"
+
+
+def load_app(relative_path):
+    # Several apps have no .py extension, so load them by path
+    loader = importlib.machinery.SourceFileLoader("bench_app", os.path.join(repo_root, relative_path))
+    spec = importlib.util.spec_from_loader("bench_app", loader)
+    module = importlib.util.module_from_spec(spec)
+    # Running a Streamlit script outside `streamlit run` logs a warning per widget; mute them
+    logging.disable(logging.WARNING)
+    try:
+        loader.exec_module(module)
+    finally:
+        logging.disable(logging.NOTSET)
+    module.api_key = "mock-key"
+    return module
+
+
+# --- 2. THE APP CALLS ---
+# name -> (script, function, args for request i). Every request gets unique input so the
+# LLM cache never short-circuits the measurement.
+DOC = "Q3 revenue grew 18% while churn fell to 2.1%. The board approved the EU launch. " * 200
+RESUME = "Growth engineer. Built Python lead pipelines, Streamlit tools and cold email automation. " * 20
+JD = "We need a growth engineer with Python, SQL, experimentation and lifecycle marketing experience. " * 10
+SALES = pd.DataFrame({"month": ["Jan", "Feb", "Mar"], "revenue": [120, 135, 160]})
+# Boardroom Brain and DocuMind send retrieved passages rather than the whole document
+BOARD_INDEX = BM25Index(chunk_pages([DOC[i:i + 3000] for i in range(0, len(DOC), 3000)]))
+
+APPS = {
+    "growth_engine": ("Growth Engine/main.py", "generate_content",
+                      lambda i: (f"Launch notes #{i}", "Shipped a lead extractor that runs 2x faster.", "Founder", NullPlaceholder())),
+    "boardroom": ("11_boardroom_brain/main.py", "ask_gemini",
+                  lambda i: (f"What drove revenue growth? (#{i})", format_context(BOARD_INDEX.search("revenue growth")), NullPlaceholder())),
+    "voice_ops": ("12_VOICE_OPS/MAIN.py", "process_audio",
+                  lambda i: (FakeAudio(i.to_bytes(4, "big") * 80000),)),
+    "resume_arch": ("13_resume arch/main.py", "analyze_resume",
+                    lambda i: (RESUME, f"{JD} Req #{i}", NullPlaceholder())),
+    "competitor_spy": ("15_competitor_spy/main", "generate_battle_card",
+                       lambda i: (f"https://competitor{i}.example.com", DOC[:10000])),
+    "documind": ("18_ DocuMind/main.py", "ask_gemini",
+                 lambda i: (f"Summarize the board decisions (#{i})", format_context(BOARD_INDEX.search("board decisions")), NullPlaceholder())),
+    "carousel": ("DAY 16_ CAROUSEL V4/MAIN", "generate_content",
+                 lambda i: (f"Cold email lessons #{i}",)),
+    "cold_email": ("day 17 Cold Email Architect/main", "generate_campaign",
+                   lambda i: (f"CTO of a Series A Fintech #{i}", "Payments 2x faster.", "Founder", "AIDA", "Casual", NullPlaceholder())),
+    "insight_engine": ("insight engine/main.py", "analyze_and_plot",
+                       lambda i: (SALES, f"Plot revenue by month #{i}")),
+}
+
+
+# --- 3. MEASUREMENT ---
+def percentile(sorted_values, q):
+    # Nearest-rank percentile
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, int(round(q / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def bench_app(name, requests, concurrency):
+    script, function_name, make_args = APPS[name]
+    fn = getattr(load_app(script), function_name)
+
+    def one(i):
+        start = time.perf_counter()
+        try:
+            fn(*make_args(i))
+            return time.perf_counter() - start, None
+        except Exception as e:
+            return time.perf_counter() - start, e
+
+    telemetry.set_app(name)
+    mock_genai.reset_mock()
+    streaming.LATENCY_LOG.clear()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - start
+
+    latencies = sorted(t for t, _ in results)
+    ttfts = sorted(t["ttft"] for t in streaming.LATENCY_LOG)
+    stats = mock_genai.mock_stats()
+    return {
+        "app": name,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "ttft_p50": percentile(ttfts, 50),
+        "rps": requests / wall,
+        "raised": sum(e is not None for _, e in results),
+        "injected": stats["errors"] + stats["rate_limited"],
+    }
+
+
+# --- EXECUTION ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latency benchmark for the Gemini tools against a local mock.")
+    parser.add_argument("--apps", nargs="+", choices=sorted(APPS), default=sorted(APPS))
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=mock_genai.SETTINGS["latency"])
+    parser.add_argument("--tokens-per-second", type=float, default=mock_genai.SETTINGS["tokens_per_second"])
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rpm", type=int, default=0, help="simulate a requests-per-minute quota (0 = none)")
+    args = parser.parse_args()
+
+    mock_genai.set_mock(latency=args.latency, tokens_per_second=args.tokens_per_second,
+                        error_rate=args.error_rate, rpm_limit=args.rpm or None)
+    print(f"🧪 {args.requests} requests per app at concurrency {args.concurrency} "
+          f"(mock latency {args.latency}s, {args.tokens_per_second:g} tok/s, error rate {args.error_rate:.0%})")
+    print("-------------------------------------------------------------------------------")
+    print(f"{'app':<16}{'p50':>8}{'p95':>8}{'p99':>8}{'ttft p50':>10}{'req/s':>8}{'raised':>8}{'injected':>10}")
+    for name in args.apps:
+        r = bench_app(name, args.requests, args.concurrency)
+        ttft = f"{r['ttft_p50']:.2f}s" if r["ttft_p50"] == r["ttft_p50"] else "-"
+        print(f"{r['app']:<16}{r['p50']:>7.2f}s{r['p95']:>7.2f}s{r['p99']:>7.2f}s{ttft:>10}{r['rps']:>8.1f}{r['raised']:>8}{r['injected']:>10}")
+    print("-------------------------------------------------------------------------------")
+    print("⚠️ 'raised' counts exceptions that escaped the app; some apps turn errors into messages instead.")
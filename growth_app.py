@@ -1,30 +1,181 @@
 import streamlit as st
 import pandas as pd
+import hashlib
+import math
+import os
+import re
+import string
+import tempfile
+import zipfile
 
 # --- 1. APP CONFIGURATION ---
 st.set_page_config(page_title="Growth Command Center", page_icon="🚀")
 
+# Only one page of leads is ever sent to the browser
+PAGE_SIZES = [50, 100, 500]
+
+# Pitch templates, parsed once and rendered with {recipient_name} / {service_pitch}
+PITCH_TEMPLATES = {
+    "Web Design": """
+            Subject: Quick question about your website
+            
+            Hi {recipient_name},
+            
+            I was researching businesses in Dehradun and found your contact details.
+            I noticed your website isn't mobile-optimized, which means you're likely losing 40% of traffic.
+            
+            I build high-conversion landing pages using Python automation.
+            Can I send you a mockup this week?
+            
+            Best,
+            Smit
+            """,
+    "Default": """
+            Subject: Scaling your organic traffic
+            
+            Hi {recipient_name},
+            
+            Found you in our lead database. Wanted to ask if you are currently looking for help with {service_pitch}?
+            
+            Best,
+            Smit
+            """,
+}
+COMPILED_TEMPLATES = {name: list(string.Formatter().parse(text)) for name, text in PITCH_TEMPLATES.items()}
+UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9]+")
+NO_NAME_COLUMN = '(none: "Hi there")'
+
+def render_emails(service_pitch, fields):
+    """Renders the pitch template for every row at once via column-wise string concatenation."""
+    compiled = COMPILED_TEMPLATES.get(service_pitch, COMPILED_TEMPLATES["Default"])
+    body = ""
+    for literal, field, _, _ in compiled:
+        body = body + literal
+        if field is not None:
+            body = body + fields[field]
+    return body
+
+def as_download(spool):
+    # Hands a finished temp file to st.download_button, which reads from a BufferedReader;
+    # the file is deleted once the reader is closed
+    spool.flush()
+    reader = os.fdopen(os.dup(spool.fileno()), "rb")
+    spool.close()
+    reader.seek(0)
+    return reader
+
+def build_bulk_export(df, name_column, service_pitch, export_format):
+    # Runs only when the download button is clicked; nothing is kept in the session
+    if name_column == NO_NAME_COLUMN:
+        names = pd.Series("there", index=df.index)
+    else:
+        names = df[name_column].astype(str).where(df[name_column].notna(), "there")
+    bodies = render_emails(service_pitch, {"recipient_name": names, "service_pitch": service_pitch})
+    export = pd.DataFrame({"Recipient": names, "Email Body": bodies})
+    if "Value" in df.columns and name_column != "Value":
+        export.insert(1, "Contact", df["Value"])
+
+    # Written to a temp file on disk, not grown in a BytesIO and then copied out of it
+    spool = tempfile.TemporaryFile()
+    if export_format == "CSV":
+        # pyarrow's CSV writer is ~30x faster than to_csv() on 500k multi-line bodies
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pa_csv
+            pa_csv.write_csv(pa.Table.from_pandas(export, preserve_index=False), spool)
+        except ImportError:
+            export.to_csv(spool, index=False, encoding="utf-8")
+        return as_download(spool)
+
+    # Stored, not deflated: each email is compressed on its own, so deflate only trims about a
+    # quarter off a few hundred bytes per file and costs ~30% more time on 500k files
+    with zipfile.ZipFile(spool, "w", zipfile.ZIP_STORED) as archive:
+        for i, (name, body) in enumerate(zip(export["Recipient"], export["Email Body"]), start=1):
+            archive.writestr(f"{i:06d}_{UNSAFE_FILENAME_CHARS.sub('_', name)[:40]}.txt", body)
+    return as_download(spool)
+
+# --- CACHED LOADING ---
+# Keyed by the SHA-256 of the upload, so reruns (every click) skip the parse entirely
+@st.cache_resource(show_spinner="📂 Parsing leads...", max_entries=4)
+def load_leads(content_hash, _uploaded_file):
+    # Parquet skips the CSV parse and keeps typed columns
+    if _uploaded_file.name.lower().endswith(".parquet"):
+        return pd.read_parquet(_uploaded_file)
+    return pd.read_csv(_uploaded_file, dtype={"Type": "category"})
+
+@st.cache_data(max_entries=4)
+def lead_metrics(content_hash, _df):
+    # Computed once per upload, not on every rerun
+    sources = sorted(_df["Type"].dropna().unique()) if "Type" in _df.columns else []
+    return {"total": len(_df), "sources": sources}
+
+def filter_leads(df, search, types):
+    if types:
+        df = df[df["Type"].isin(types)]
+    if search:
+        mask = pd.Series(False, index=df.index)
+        for column in df.select_dtypes(include=["object", "string", "category"]).columns:
+            mask |= df[column].astype(str).str.contains(search, case=False, regex=False, na=False)
+        df = df[mask]
+    return df
+
 # --- 2. THE UI HEADER ---
 st.title("🚀 Growth Command Center")
 st.write("internal tool to manage leads and automate outreach.")
 st.divider()
 
 # --- 3. FILE UPLOADER ---
-uploaded_file = st.file_uploader("📂 Upload your Leads CSV", type=["csv"])
+uploaded_file = st.file_uploader("📂 Upload your Leads CSV or Parquet", type=["csv", "parquet"])
 
 if uploaded_file is not None:
-    # Load data
-    df = pd.read_csv(uploaded_file)
+    # Load data (cached), then keep one editable working copy per upload in the session
+    content_hash = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+    if st.session_state.get("leads_hash") != content_hash:
+        st.session_state.leads = load_leads(content_hash, uploaded_file).copy()
+        st.session_state.leads_hash = content_hash
+    df = st.session_state.leads
+    metrics = lead_metrics(content_hash, df)
     
     # Show metrics
     col1, col2 = st.columns(2)
     col1.metric("Total Leads", len(df))
-    col2.metric("Unique Sources", df['Type'].nunique())
+    col2.metric("Unique Sources", len(metrics["sources"]))
     
     # --- 4. DATA EDITOR ---
     st.subheader("🔍 Lead Database")
-    # Interactive table - you can sort and filter inside the browser!
-    edited_df = st.data_editor(df, num_rows="dynamic")
+    # Filtering and paging run on the server; the browser only gets the current page
+    f1, f2, f3 = st.columns([2, 2, 1])
+    search = f1.text_input("Search leads", placeholder="name, email, phone...")
+    types = f2.multiselect("Type", metrics["sources"])
+    page_size = f3.selectbox("Rows / page", PAGE_SIZES)
+    
+    view = filter_leads(df, search, types)
+    pages = max(1, math.ceil(len(view) / page_size))
+    page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, step=1)
+    page_df = view.iloc[(page - 1) * page_size : page * page_size]
+    
+    # The editor stores edits by row position, so its key pins the exact rows on screen
+    # (search, type filter and page all change it) plus a version bumped after every write-back
+    rows_id = hashlib.sha1(page_df.index.values.tobytes()).hexdigest()[:12]
+    editor_key = f"editor_{content_hash}_{st.session_state.get('editor_version', 0)}_{rows_id}"
+    edited_page = st.data_editor(page_df, key=editor_key, num_rows="dynamic", width="stretch")
+    st.caption(f"Showing {len(page_df)} of {len(view):,} matching leads")
+    
+    # Write this page's edits, new rows and deletions back into the full working copy
+    if not edited_page.equals(page_df):
+        kept = edited_page[edited_page.index.isin(page_df.index)]
+        added = edited_page[~edited_page.index.isin(page_df.index)]
+        df.loc[kept.index, kept.columns] = kept
+        df = df.drop(page_df.index.difference(edited_page.index))
+        if len(added):
+            # New rows get ids after every existing lead, not after this page's last row
+            start = df.index.max() + 1 if len(df) else 0
+            df = pd.concat([df, added.set_axis(range(start, start + len(added)))])
+        st.session_state.leads = df
+        # A fresh editor, so the same edits are never replayed onto the updated copy
+        st.session_state.editor_version = st.session_state.get("editor_version", 0) + 1
+        st.rerun()
+    edited_df = df
     
     # --- 5. EMAIL GENERATOR ---
     st.divider()
@@ -37,37 +188,31 @@ if uploaded_file is not None:
         st.success("Draft Generated!")
         
         # The Email Template Logic
-        if service_pitch == "Web Design":
-            email_body = f"""
-            Subject: Quick question about your website
-            
-            Hi {recipient_name},
-            
-            I was researching businesses in Dehradun and found your contact details.
-            I noticed your website isn't mobile-optimized, which means you're likely losing 40% of traffic.
-            
-            I build high-conversion landing pages using Python automation.
-            Can I send you a mockup this week?
-            
-            Best,
-            Smit
-            """
-        else:
-            email_body = f"""
-            Subject: Scaling your organic traffic
-            
-            Hi {recipient_name},
-            
-            Found you in our lead database. Wanted to ask if you are currently looking for help with {service_pitch}?
-            
-            Best,
-            Smit
-            """
+        template = PITCH_TEMPLATES.get(service_pitch, PITCH_TEMPLATES["Default"])
+        email_body = template.format(recipient_name=recipient_name, service_pitch=service_pitch)
             
         st.code(email_body, language="text")
+    
+    # --- 6. BULK OUTREACH ---
+    st.divider()
+    st.subheader("📦 Bulk Outreach Export")
+    st.caption("Renders the selected pitch for every lead. Emails are generated when you click download.")
+    
+    # Without a name column, emails open with "Hi there" rather than "Hi lead0@x.com"
+    name_options = [NO_NAME_COLUMN] + list(edited_df.columns)
+    default_name = next((c for c in ["Full Name", "Name"] if c in name_options), NO_NAME_COLUMN)
+    name_column = st.selectbox("Recipient Name Column", name_options, index=name_options.index(default_name))
+    export_format = st.radio("Export As", ["CSV", "ZIP (one .txt per lead)"], horizontal=True)
+    
+    st.download_button(
+        f"⬇️ Download {len(edited_df):,} {service_pitch} Emails",
+        data=lambda: build_bulk_export(edited_df, name_column, service_pitch, export_format),
+        file_name="bulk_outreach.csv" if export_format == "CSV" else "bulk_outreach.zip",
+        mime="text/csv" if export_format == "CSV" else "application/zip",
+    )
 
 else:
-    st.info("👆 Upload a CSV file to get started.")
+    st.info("👆 Upload a CSV or Parquet file to get started.")
 
 # --- SIDEBAR ---
 with st.sidebar:
@@ -0,0 +1 @@
+"""Shared helpers for the Gemini-backed tools in this repo."""
@@ -0,0 +1,213 @@
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+from growth_ops.retrieval import STOPWORDS
+
+# --- LOCAL ATS MATCHING ---
+# Match scores and missing keywords used to cost a multi-second Gemini call. This is a
+# deterministic stand-in that runs in milliseconds: skill phrases are pulled out of both texts
+# with a bundled lexicon, the remaining keywords are TF-IDF weighted, and the gaps are a plain
+# set difference. The LLM is only needed for the rewriting.
+
+# Canonical skill -> aliases (lowercase). Multi-word and punctuated skills are matched as phrases.
+SKILLS_LEXICON = {
+    # Languages & engineering
+    "Python": ["python", "python3"], "SQL": ["sql", "postgresql", "postgres", "mysql", "sqlite", "t-sql"],
+    "JavaScript": ["javascript", "js", "es6"], "TypeScript": ["typescript"], "Java": ["java"],
+    "Go": ["golang"], "C++": ["c++", "cpp"], "C#": ["c#", ".net", "dotnet"], "Rust": ["rust"], "R": ["r programming", "rstudio"],
+    "HTML/CSS": ["html", "css", "html5", "tailwind"], "React": ["react", "react.js", "reactjs", "next.js", "nextjs"],
+    "Node.js": ["node.js", "nodejs", "node", "express.js"], "Django": ["django"], "Flask": ["flask"], "FastAPI": ["fastapi"],
+    "Streamlit": ["streamlit"], "REST APIs": ["rest api", "rest apis", "restful", "api integration", "api integrations"],
+    "GraphQL": ["graphql"], "Git": ["git", "github", "gitlab"], "Docker": ["docker", "containers"], "Kubernetes": ["kubernetes", "k8s"],
+    "CI/CD": ["ci/cd", "continuous integration", "github actions", "jenkins"], "Linux": ["linux", "bash", "shell scripting"],
+    "AWS": ["aws", "amazon web services", "lambda", "s3", "ec2"], "GCP": ["gcp", "google cloud", "bigquery"], "Azure": ["azure"],
+    "Terraform": ["terraform", "infrastructure as code"], "Microservices": ["microservices", "microservice"],
+    "System Design": ["system design", "distributed systems"], "Testing": ["unit testing", "pytest", "test automation", "tdd"],
+    # Data & AI
+    "Pandas": ["pandas"], "NumPy": ["numpy"], "Excel": ["excel", "spreadsheets", "google sheets", "vlookup", "pivot tables"],
+    "Tableau": ["tableau"], "Power BI": ["power bi", "powerbi"], "Looker": ["looker", "looker studio", "data studio"],
+    "Data Analysis": ["data analysis", "data analytics", "analytics"], "Data Visualization": ["data visualization", "dashboards", "dashboarding"],
+    "ETL": ["etl", "elt", "data pipelines", "data pipeline", "airflow", "dbt"], "Spark": ["spark", "pyspark", "databricks"],
+    "Snowflake": ["snowflake"], "Machine Learning": ["machine learning", "ml", "scikit-learn", "sklearn"],
+    "Deep Learning": ["deep learning", "pytorch", "tensorflow", "keras"], "NLP": ["nlp", "natural language processing"],
+    "LLMs": ["llm", "llms", "large language models", "generative ai", "genai", "gpt", "gemini", "openai", "langchain", "rag"],
+    "Prompt Engineering": ["prompt engineering"], "Statistics": ["statistics", "statistical analysis", "regression"],
+    "A/B Testing": ["a/b testing", "a/b tests", "ab testing", "split testing", "experimentation", "experiments"],
+    "Web Scraping": ["web scraping", "scraping", "beautifulsoup", "selenium", "scrapy", "playwright"],
+    "Automation": ["automation", "workflow automation", "zapier", "make.com", "n8n"],
+    # Growth, marketing & sales
+    "Growth Marketing": ["growth marketing", "growth hacking", "growth"], "SEO": ["seo", "search engine optimization"],
+    "SEM": ["sem", "ppc", "google ads", "paid search"], "Paid Social": ["paid social", "facebook ads", "meta ads", "linkedin ads"],
+    "Content Marketing": ["content marketing", "content strategy", "copywriting", "blogging"],
+    "Email Marketing": ["email marketing", "cold email", "cold outreach", "email campaigns", "newsletters", "mailchimp", "klaviyo"],
+    "Lifecycle Marketing": ["lifecycle marketing", "retention marketing", "crm marketing", "onboarding flows"],
+    "Social Media": ["social media", "linkedin", "twitter", "instagram", "tiktok"], "Product Marketing": ["product marketing", "positioning", "go-to-market", "gtm"],
+    "Demand Generation": ["demand generation", "demand gen", "lead generation", "lead gen"],
+    "Marketing Analytics": ["google analytics", "ga4", "mixpanel", "amplitude", "attribution", "funnel analysis"],
+    "Conversion Optimization": ["conversion rate optimization", "cro", "landing pages"],
+    "CRM": ["crm", "hubspot", "salesforce", "pipedrive"], "Sales": ["sales", "b2b sales", "outbound", "prospecting", "cold calling"],
+    "Account Management": ["account management", "customer success", "client management"],
+    "Partnerships": ["partnerships", "business development", "bizdev"], "Community": ["community building", "community management"],
+    "Pricing": ["pricing", "monetization"], "Market Research": ["market research", "competitive analysis", "competitor analysis", "customer research"],
+    # Product, design & operations
+    "Product Management": ["product management", "product manager", "roadmapping", "roadmap", "prioritization"],
+    "Agile": ["agile", "scrum", "kanban", "sprint planning", "jira"], "Project Management": ["project management", "pmp", "asana", "notion"],
+    "UX Design": ["ux", "ui/ux", "user research", "wireframing", "prototyping", "figma"],
+    "Stakeholder Management": ["stakeholder management", "cross-functional", "cross functional"],
+    "Financial Modeling": ["financial modeling", "financial modelling", "fp&a", "forecasting", "budgeting"],
+    "Operations": ["operations", "process improvement", "sops"], "Recruiting": ["recruiting", "talent acquisition", "sourcing"],
+    "Leadership": ["leadership", "team lead", "people management", "mentoring"], "Communication": ["communication", "presentation", "public speaking"],
+}
+
+SKILL_WEIGHT = 0.6       # share of the score that comes from lexicon skills; the rest is keyword overlap
+MISSING_LIMIT = 5
+SKILL_BOOST = 2.0        # lexicon skills count double in the batch similarity vectors
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9+#]*(?:[./-][a-z0-9+#]+)*")
+# JD boilerplate that says nothing about fit
+FILLER_WORDS = STOPWORDS | frozenset(
+    "about across all also am any able ability work working team teams role roles job candidate candidates "
+    "experience experienced years year strong excellent good great plus preferred required requirements "
+    "responsibilities responsible including include such etc using use new other more must should can "
+    "would looking join company help ensure within day based well highly skills skill knowledge "
+    "understanding familiarity proven track record environment opportunity hiring bonus nice build built "
+    "own owning ship shipping drive driving deliver manage managing daily weekly monthly need needs want".split()
+)
+
+_ALIASES = {alias: canonical for canonical, aliases in SKILLS_LEXICON.items() for alias in aliases}
+_SKILL_WORDS = frozenset(word for alias in _ALIASES for word in alias.split())
+# Longest aliases first so "google analytics" wins over "analytics"; no letters/digits on either side
+_SKILL_PATTERN = re.compile(
+    r"(?<![a-z0-9+#])(" + "|".join(re.escape(alias) for alias in sorted(_ALIASES, key=len, reverse=True)) + r")(?![a-z0-9+#])"
+)
+
+
+def extract_skills(text):
+    """Lexicon skills mentioned in the text: Counter of canonical name -> mentions."""
+    return Counter(_ALIASES[match] for match in _SKILL_PATTERN.findall(text.lower()))
+
+
+def _stem(token):
+    # Just enough to match "campaigns" with "campaign"
+    if len(token) > 4 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def keyword_tokens(text):
+    """Non-filler words, lightly stemmed. Words that belong to lexicon skills are left to extract_skills()."""
+    tokens = (t.strip(".-/") for t in TOKEN_PATTERN.findall(text.lower()))
+    stems = (_stem(t) for t in tokens if len(t) > 2 and t not in FILLER_WORDS and t not in _SKILL_WORDS)
+    return [t for t in stems if t not in _SKILL_WORDS]
+
+
+def _sentences(text):
+    return [s for s in re.split(r"[\n.;•]+", text) if s.strip()]
+
+
+def _idf(texts):
+    # Document frequency over the sentences of both texts: words in every line are boilerplate
+    sentences = [set(keyword_tokens(s)) for text in texts for s in _sentences(text)]
+    df = Counter(term for sentence in sentences for term in sentence)
+    return {term: math.log((1 + len(sentences)) / (1 + count)) + 1 for term, count in df.items()}
+
+
+def tfidf_weights(tokens, idf):
+    return {term: (1 + math.log(tf)) * idf.get(term, 1.0) for term, tf in Counter(tokens).items()}
+
+
+def _coverage(weights, present):
+    total = sum(weights.values())
+    return sum(w for term, w in weights.items() if term in present) / total if total else None
+
+
+def ats_match(resume_text, jd_text, missing_limit=MISSING_LIMIT):
+    """Match score (0-100) of a resume against a JD, plus the JD skills and keywords it lacks."""
+    idf = _idf([resume_text, jd_text])
+    jd_skills, resume_skills = extract_skills(jd_text), extract_skills(resume_text)
+    jd_keywords = tfidf_weights(keyword_tokens(jd_text), idf)
+    resume_keywords = set(keyword_tokens(resume_text))
+
+    # Skills are weighted like keywords: repeated mentions in the JD count for more
+    skill_weights = {skill: 1 + math.log(count) for skill, count in jd_skills.items()}
+    skill_coverage = _coverage(skill_weights, resume_skills)
+    keyword_coverage = _coverage(jd_keywords, resume_keywords)
+
+    if skill_coverage is None and keyword_coverage is None:
+        score = 0.0
+    elif skill_coverage is None or keyword_coverage is None:
+        score = skill_coverage if keyword_coverage is None else keyword_coverage
+    else:
+        score = SKILL_WEIGHT * skill_coverage + (1 - SKILL_WEIGHT) * keyword_coverage
+
+    by_weight = lambda weights: sorted(weights, key=lambda term: (-weights[term], term))
+    return {
+        "score": round(100 * score),
+        "matched_skills": by_weight({s: w for s, w in skill_weights.items() if s in resume_skills}),
+        "missing_skills": by_weight({s: w for s, w in skill_weights.items() if s not in resume_skills})[:missing_limit],
+        "missing_keywords": by_weight({t: w for t, w in jd_keywords.items() if t not in resume_keywords})[:missing_limit],
+        "skill_coverage": skill_coverage,
+        "keyword_coverage": keyword_coverage,
+    }
+
+
+def format_ats_report(report):
+    """Markdown block in the same shape the LLM used to return."""
+    lines = [f"## 📊 Match Score: {report['score']}%", ""]
+    if report["matched_skills"]:
+        lines += [f"**✅ Matched skills:** {', '.join(report['matched_skills'])}", ""]
+    lines.append("### 🛑 Missing Keywords")
+    gaps = report["missing_skills"] + report["missing_keywords"]
+    lines += [f"* {gap}" for gap in gaps] or ["* None. Every JD keyword is already on the resume."]
+    return "\n".join(lines)
+
+
+# --- BATCH: MANY RESUMES x MANY JDS ---
+def document_terms(text):
+    """Keywords plus one "skill:<name>" term per lexicon skill mention."""
+    skills = extract_skills(text)
+    return keyword_tokens(text) + [f"skill:{skill}" for skill, count in skills.items() for _ in range(count)]
+
+
+def similarity_matrix(resume_texts, jd_texts):
+    """Cosine similarity of every resume against every JD, shape (resumes, JDs).
+
+    Every document is vectorized once into a sparse TF-IDF row (IDF over all of them), and the
+    product is taken over the JD non-zeros only, so hundreds of JDs cost milliseconds.
+    """
+    texts = list(resume_texts) + list(jd_texts)
+    vocab, rows, cols, vals = {}, [], [], []
+    for row, text in enumerate(texts):
+        for term, tf in Counter(document_terms(text)).items():
+            rows.append(row)
+            cols.append(vocab.setdefault(term, len(vocab)))
+            vals.append(1 + math.log(tf))
+    rows, cols, vals = np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64), np.array(vals)
+
+    df = np.bincount(cols, minlength=len(vocab))
+    idf = np.log((1 + len(texts)) / (1 + df)) + 1
+    idf[[term_id for term, term_id in vocab.items() if term.startswith("skill:")]] *= SKILL_BOOST
+    vals = vals * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights=vals * vals, minlength=len(texts)))
+    vals = vals / np.maximum(norms[rows], 1e-12)
+
+    # The few resumes go dense; the many JDs stay sparse
+    n_resumes, n_jds = len(resume_texts), len(jd_texts)
+    is_resume = rows < n_resumes
+    resumes = np.zeros((n_resumes, len(vocab)))
+    resumes[rows[is_resume], cols[is_resume]] = vals[is_resume]
+    jd_rows, jd_cols, jd_vals = rows[~is_resume] - n_resumes, cols[~is_resume], vals[~is_resume]
+
+    scores = np.zeros((n_resumes, n_jds))
+    for r in range(n_resumes):
+        scores[r] = np.bincount(jd_rows, weights=resumes[r, jd_cols] * jd_vals, minlength=n_jds)
+    return scores
+
+
+def rank_pairs(scores, top_n=None):
+    """(resume index, JD index, score) for every pair, best first."""
+    order = np.argsort(-scores, axis=None, kind="stable")[:top_n]
+    resume_ids, jd_ids = np.unravel_index(order, scores.shape)
+    return [(int(r), int(j), float(scores[r, j])) for r, j in zip(resume_ids, jd_ids)]
@@ -0,0 +1,97 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from growth_ops import telemetry
+
+# --- RATE-LIMITED BATCH RUNNER ---
+# Gemini calls are network-bound, so a thread pool gets most of the speedup. A token bucket
+# per quota (requests and tokens per minute) keeps the pool under our limits, and 429s are
+# retried with jittered exponential backoff instead of failing the row.
+
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_CAP_SECONDS = 60.0
+
+
+class TokenBucket:
+    """Refills `per_minute` tokens per minute; acquire() blocks until enough are available."""
+
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, amount=1):
+        amount = min(amount, self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def estimate_tokens(prompt):
+    # ~4 characters per token is close enough for budgeting
+    return max(1, len(prompt) // 4)
+
+
+def is_rate_limited(error):
+    # google.api_core raises ResourceExhausted (HTTP 429) when a quota is hit
+    code = getattr(error, "code", None)
+    return code == 429 or type(error).__name__ == "ResourceExhausted" or "429" in str(error)
+
+
+def backoff_delay(attempt):
+    # "Full jitter": spreads retries out so the workers don't hit the quota again in lockstep
+    return random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+def run_batch(fn, jobs, max_workers=8, rpm=None, tpm=None, max_retries=MAX_RETRIES, cost=estimate_tokens):
+    """Runs fn(job) for every job concurrently; cost(job) is its token estimate (jobs are prompts by default).
+
+    Yields (index, result, error) as each call finishes, so the caller can render results
+    while the rest are still in flight. Exactly one of result/error is None. Closing the
+    generator early (e.g. a Streamlit rerun) returns at once: queued jobs are cancelled and
+    calls in a backoff wait give up instead of retrying.
+    """
+    request_bucket = TokenBucket(rpm) if rpm else None
+    token_bucket = TokenBucket(tpm) if tpm else None
+    closed = threading.Event()
+
+    def call(job):
+        for attempt in range(max_retries + 1):
+            if request_bucket:
+                request_bucket.acquire()
+            if token_bucket:
+                token_bucket.acquire(cost(job))
+            try:
+                return fn(job)
+            except Exception as e:
+                if attempt == max_retries or not is_rate_limited(e):
+                    raise
+                delay = backoff_delay(attempt)
+                telemetry.record("retry", retries=attempt + 1, backoff=round(delay, 3), error=f"{type(e).__name__}: {e}")
+                if closed.wait(delay):
+                    raise
+
+    # Not a `with` block: its exit would wait for every job, and a closed generator must not block
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {pool.submit(call, job): i for i, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+    finally:
+        closed.set()
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,242 @@
+import json
+import math
+import os
+import threading
+from collections import Counter
+
+import numpy as np
+
+from growth_ops.llm_cache import CACHE_DIR
+from growth_ops.retrieval import TOP_K, chunk_pages, tokenize
+
+# --- PERSISTENT TF-IDF CORPUS ---
+# A library of PDFs searched as one corpus. Every chunk is a sparse TF-IDF row stored as flat
+# binary columns (row, term, tf) that are memory-mapped on load and only ever appended to, so
+# adding a document never rewrites the index. Each document's non-zeros are written in term
+# order, with a small term -> offset table per document, so a query reads only the postings
+# of its own terms. IDF and row norms are derived at load time, which keeps the weights
+# correct as the corpus grows.
+
+CORPUS_DIR = os.path.join(CACHE_DIR, "corpus")
+LAYOUT_VERSION = 2  # 2: term-ordered postings per document
+
+# Binary columns: file name -> dtype. Appended in lockstep; manifest.json holds the committed lengths.
+_COLUMNS = {
+    "rows": np.int32,          # chunk id of each non-zero
+    "terms": np.int32,         # term id of each non-zero
+    "tf": np.float32,          # 1 + log(term frequency)
+    "chunk_doc": np.int32,     # document id of each chunk
+    "chunk_page": np.int32,    # page number of each chunk
+    "text_offsets": np.int64,  # end offset of each chunk in texts.bin
+    "post_terms": np.int32,    # distinct terms of each document, sorted
+    "post_starts": np.int64,   # where each of those terms' non-zeros start
+}
+_LENGTHS = {"rows": "nnz", "terms": "nnz", "tf": "nnz", "post_terms": "postings", "post_starts": "postings"}
+_EMPTY = {"version": LAYOUT_VERSION, "documents": [], "chunks": 0, "nnz": 0, "postings": 0, "text_bytes": 0}
+
+
+def _sublinear_tf(counts):
+    return {term: 1.0 + math.log(tf) for term, tf in counts.items()}
+
+
+class CorpusIndex:
+    """Chunk-level TF-IDF index over many documents, persisted under `path`."""
+
+    def __init__(self, path=CORPUS_DIR):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self._load()
+
+    # --- STORAGE ---
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _map(self, name, length):
+        # Read-only memory map of the committed part of a column; empty files can't be mapped
+        dtype = _COLUMNS[name]
+        if length == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self._file(f"{name}.bin"), dtype=dtype, mode="r", shape=(length,))
+
+    def _load(self):
+        manifest_path = self._file("manifest.json")
+        manifest = dict(_EMPTY)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        if manifest.get("version") != LAYOUT_VERSION:
+            # An index from before the postings layout: start an empty one (the appends truncate it)
+            manifest = dict(_EMPTY)
+            if os.path.exists(self._file("vocab.json")):
+                os.remove(self._file("vocab.json"))
+        self.manifest = manifest
+        self.documents = manifest["documents"]
+
+        vocab_path = self._file("vocab.json")
+        vocab = []
+        if os.path.exists(vocab_path):
+            with open(vocab_path, "r", encoding="utf-8") as f:
+                vocab = json.load(f)
+        self.vocab = {term: term_id for term_id, term in enumerate(vocab)}
+
+        nnz, chunks = manifest["nnz"], manifest["chunks"]
+        self.rows, self.terms, self.tf = (self._map(name, nnz) for name in ("rows", "terms", "tf"))
+        self.chunk_doc, self.chunk_page, self.text_offsets = (
+            self._map(name, chunks) for name in ("chunk_doc", "chunk_page", "text_offsets"))
+        self.post_terms, self.post_starts = (self._map(name, manifest["postings"]) for name in ("post_terms", "post_starts"))
+
+        # IDF and norms depend on the whole corpus, so they're rebuilt here rather than stored
+        df = np.bincount(self.terms, minlength=len(self.vocab)).astype(np.float32)
+        self.idf = (np.log((1 + chunks) / (1 + df)) + 1).astype(np.float32)
+        weights = self.tf * self.idf[self.terms]
+        self.norms = np.sqrt(np.bincount(self.rows, weights=weights * weights, minlength=chunks)).astype(np.float32)
+
+    def _append(self, name, values):
+        # Anything past the committed length is a half-written add; drop it before appending
+        dtype = _COLUMNS[name]
+        size = self.manifest[_LENGTHS.get(name, "chunks")] * np.dtype(dtype).itemsize
+        with open(self._file(f"{name}.bin"), "ab") as f:
+            f.truncate(size)
+            f.write(np.asarray(values, dtype=dtype).tobytes())
+
+    def _write_json(self, name, payload):
+        tmp = self._file(f"{name}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp, self._file(name))
+
+    # --- UPDATES ---
+    def __len__(self):
+        return self.manifest["chunks"]
+
+    def has_document(self, doc_hash):
+        return any(doc["hash"] == doc_hash for doc in self.documents)
+
+    def add_document(self, name, doc_hash, pages):
+        """Indexes one document (a list of page strings). Returns its entry; re-adding is a no-op."""
+        with self._lock:
+            for doc in self.documents:
+                if doc["hash"] == doc_hash:
+                    return doc
+
+            chunks = chunk_pages(pages)
+            doc_id = len(self.documents)
+            first_chunk = self.manifest["chunks"]
+            vocab = dict(self.vocab)
+            rows, terms, tf, offsets, texts = [], [], [], [], []
+            text_end = self.manifest["text_bytes"]
+            for offset, chunk in enumerate(chunks):
+                for term, weight in _sublinear_tf(Counter(tokenize(chunk["text"]))).items():
+                    rows.append(first_chunk + offset)
+                    terms.append(vocab.setdefault(term, len(vocab)))
+                    tf.append(weight)
+                encoded = chunk["text"].encode("utf-8")
+                texts.append(encoded)
+                text_end += len(encoded)
+                offsets.append(text_end)
+
+            # Term order within the document, so each term's non-zeros are one contiguous slice
+            rows, terms, tf = np.asarray(rows, dtype=np.int32), np.asarray(terms, dtype=np.int32), np.asarray(tf, dtype=np.float32)
+            order = np.lexsort((rows, terms))
+            rows, terms, tf = rows[order], terms[order], tf[order]
+            post_terms, post_starts = np.unique(terms, return_index=True)
+            first_nnz = self.manifest["nnz"]
+
+            # Release the maps before the files underneath them change
+            self._release()
+            for column, values in (("rows", rows), ("terms", terms), ("tf", tf), ("text_offsets", offsets),
+                                   ("chunk_doc", [doc_id] * len(chunks)),
+                                   ("chunk_page", [chunk["page"] for chunk in chunks]),
+                                   ("post_terms", post_terms), ("post_starts", post_starts + first_nnz)):
+                self._append(column, values)
+            with open(self._file("texts.bin"), "ab") as f:
+                f.truncate(self.manifest["text_bytes"])
+                f.write(b"".join(texts))
+
+            entry = {"id": doc_id, "name": name, "hash": doc_hash, "pages": len(pages), "chunks": len(chunks),
+                     "postings": [self.manifest["postings"], len(post_terms)], "nnz_end": first_nnz + len(rows)}
+            self._write_json("vocab.json", sorted(vocab, key=vocab.get))
+            # The manifest is written last: until it lands, the new rows don't exist
+            self._write_json("manifest.json", {
+                "version": LAYOUT_VERSION,
+                "documents": self.documents + [entry],
+                "chunks": first_chunk + len(chunks),
+                "nnz": first_nnz + len(rows),
+                "postings": self.manifest["postings"] + len(post_terms),
+                "text_bytes": text_end,
+            })
+            self._load()
+            return entry
+
+    def _release(self):
+        self.rows = self.terms = self.tf = self.chunk_doc = self.chunk_page = self.text_offsets = None
+        self.post_terms = self.post_starts = None
+
+    def clear(self):
+        with self._lock:
+            self._release()
+            for name in list(_COLUMNS) + ["texts"]:
+                if os.path.exists(self._file(f"{name}.bin")):
+                    os.remove(self._file(f"{name}.bin"))
+            for name in ("manifest.json", "vocab.json"):
+                if os.path.exists(self._file(name)):
+                    os.remove(self._file(name))
+            self._load()
+
+    # --- QUERIES ---
+    def _chunk_text(self, chunk_id):
+        start = int(self.text_offsets[chunk_id - 1]) if chunk_id else 0
+        with open(self._file("texts.bin"), "rb") as f:
+            f.seek(start)
+            return f.read(int(self.text_offsets[chunk_id]) - start).decode("utf-8")
+
+    def search(self, query, k=TOP_K):
+        """Top-k chunks by cosine similarity, best first: [{"doc", "name", "page", "text", "score"}, ...]."""
+        with self._lock:
+            return self._search(query, k)
+
+    def _search(self, query, k):
+        query_tf = _sublinear_tf(Counter(t for t in tokenize(query) if t in self.vocab))
+        if not query_tf or not len(self):
+            return []
+        query_vec = np.zeros(len(self.vocab), dtype=np.float32)
+        for term, weight in query_tf.items():
+            query_vec[self.vocab[term]] = weight * self.idf[self.vocab[term]]
+
+        # Sparse matrix-vector product over the query terms' postings only, then cosine normalization
+        query_terms = np.array(sorted(self.vocab[term] for term in query_tf), dtype=np.int32)
+        hit_rows, contributions = [], []
+        for doc in self.documents:
+            first, count = doc["postings"]
+            doc_terms = self.post_terms[first:first + count]
+            found = np.searchsorted(doc_terms, query_terms)
+            for term, i in zip(query_terms, found):
+                if i == count or doc_terms[i] != term:
+                    continue
+                start = int(self.post_starts[first + i])
+                stop = int(self.post_starts[first + i + 1]) if i + 1 < count else doc["nnz_end"]
+                hit_rows.append(self.rows[start:stop])
+                contributions.append(self.tf[start:stop] * (self.idf[term] * query_vec[term]))
+        if not hit_rows:
+            return []
+        scores = np.bincount(np.concatenate(hit_rows), weights=np.concatenate(contributions), minlength=len(self))
+        scores /= np.maximum(self.norms, 1e-9) * np.linalg.norm(query_vec)
+
+        k = min(k, int(np.count_nonzero(scores)))
+        if k == 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        hits = []
+        for chunk_id in best:
+            doc = self.documents[int(self.chunk_doc[chunk_id])]
+            hits.append({"doc": doc["id"], "name": doc["name"], "page": int(self.chunk_page[chunk_id]),
+                         "text": self._chunk_text(int(chunk_id)), "score": float(scores[chunk_id])})
+        return hits
+
+
+def format_corpus_context(hits):
+    """Chunks as prompt context, grouped by document in page order, tagged for citations."""
+    ordered = sorted(hits, key=lambda hit: (hit["doc"], hit["page"]))
+    return "\n\n".join(f"[{hit['name']}, page {hit['page']}]\n{hit['text']}" for hit in ordered)
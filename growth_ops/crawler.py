@@ -0,0 +1,247 @@
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from urllib.parse import urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from growth_ops import http_cache
+
+# --- CONCURRENT CRAWLER ---
+# Fetches many competitor pages at once over one pooled keep-alive session. Each host gets at
+# most PER_HOST_LIMIT requests in flight and a politeness gap between them (robots.txt
+# Crawl-delay wins if it asks for more), disallowed paths are skipped, and the whole crawl
+# runs against one time budget. Results are yielded as they land. Pages go through the
+# conditional-GET cache (growth_ops/http_cache.py): fresh ones cost no request at all.
+
+ROBOTS_AGENT = "GrowthOpsBot"  # the name robots.txt rules are matched against
+# Requests say who we are, under the same name the robots.txt rules were checked for
+USER_AGENT = f"{ROBOTS_AGENT}/1.0 (+https://github.com/smitgodiyal872-sketch/growth-ops-automation-toolkit)"
+
+MAX_WORKERS = 16
+HOST_POOLS = 100            # keep-alive pools kept open, one per host (we track ~80 competitors)
+PER_HOST_LIMIT = 2
+POLITENESS_DELAY = 1.0      # seconds between request starts on the same host
+REQUEST_TIMEOUT = 10
+CRAWL_BUDGET_SECONDS = 60
+MAX_TEXT_CHARS = 10000      # per page, to save tokens
+MAX_SITEMAP_URLS = 200
+
+
+def make_session(pool_size=MAX_WORKERS):
+    """requests.Session with a keep-alive pool per host, each big enough for every worker."""
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    # pool_connections is the number of hosts kept warm; fewer than the crawl touches means reconnecting
+    adapter = HTTPAdapter(pool_connections=HOST_POOLS, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def html_to_text(html, max_chars=MAX_TEXT_CHARS):
+    """Visible text of a page, one phrase per line."""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Kill all script and style elements
+    for script in soup(["script", "style"]):
+        script.extract()
+
+    # Break into lines and remove leading and trailing space on each
+    lines = (line.strip() for line in soup.get_text().splitlines())
+    # Break multi-headlines into a line each
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    # Drop blank lines
+    return '\n'.join(chunk for chunk in chunks if chunk)[:max_chars]
+
+
+def fetch(session, url, timeout=REQUEST_TIMEOUT):
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response
+
+
+def page_text(session, url, ttl=http_cache.FRESHNESS_TTL_SECONDS, timeout=REQUEST_TIMEOUT, max_chars=MAX_TEXT_CHARS):
+    """Visible text of a page through the conditional-GET cache. Returns (text, cache outcome)."""
+    # The full text is cached, so a later call with a bigger max_chars still gets all of it
+    text, outcome = http_cache.cached_text(session, url, lambda content: html_to_text(content, None), ttl, timeout)
+    return text[:max_chars], outcome
+
+
+# --- POLITENESS ---
+class HostGate:
+    """Per-host concurrency limit plus a minimum gap between request starts."""
+
+    def __init__(self, limit, delay):
+        self.slots = threading.Semaphore(limit)
+        self.delay = delay
+        self.next_start = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self, deadline):
+        """Waits for a slot and this host's next start time; False if that would be past the deadline."""
+        if not self.slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            return False
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            if start >= deadline:
+                self.slots.release()
+                return False
+            self.next_start = start + self.delay
+        time.sleep(start - now)
+        return True
+
+    def release(self):
+        self.slots.release()
+
+
+class Politeness:
+    """robots.txt rules and one HostGate per host, fetched lazily and shared by all workers."""
+
+    def __init__(self, session, per_host=PER_HOST_LIMIT, delay=POLITENESS_DELAY, timeout=REQUEST_TIMEOUT):
+        self.session, self.per_host, self.delay, self.timeout = session, per_host, delay, timeout
+        self.robots, self.gates = {}, {}
+        self.host_locks = defaultdict(threading.Lock)
+        self.lock = threading.Lock()
+
+    def _robots(self, host_url):
+        with self.lock:
+            host_lock = self.host_locks[host_url]
+        # One robots.txt request per host, even when many workers ask at once
+        with host_lock:
+            if host_url not in self.robots:
+                parser = RobotFileParser()
+                try:
+                    response = self.session.get(urljoin(host_url, "/robots.txt"), timeout=self.timeout)
+                    parser.parse(response.text.splitlines() if response.status_code == 200 else [])
+                except requests.RequestException:
+                    parser.parse([])  # unreachable robots.txt: assume everything is allowed
+                delay = max(self.delay, parser.crawl_delay(ROBOTS_AGENT) or 0)
+                self.robots[host_url] = parser
+                self.gates[host_url] = HostGate(self.per_host, delay)
+        return self.robots[host_url], self.gates[host_url]
+
+    def gate(self, url):
+        """The host's gate, or None when robots.txt disallows the URL."""
+        parts = urlsplit(url)
+        robots, gate = self._robots(f"{parts.scheme}://{parts.netloc}")
+        return gate if robots.can_fetch(ROBOTS_AGENT, url) else None
+
+
+# --- SITEMAPS ---
+def read_sitemap(session, url, max_urls=MAX_SITEMAP_URLS, politeness=None, deadline=None, failures=None):
+    """Page URLs listed in a sitemap.xml; sitemap indexes are followed one level down.
+
+    Sitemaps are fetched like pages: robots.txt, the host's gate and the deadline all apply.
+    One that can't be fetched or parsed adds no URLs and is appended to failures as "url: error".
+    """
+    politeness = politeness or Politeness(session)
+    deadline = deadline or time.monotonic() + CRAWL_BUDGET_SECONDS
+    failures = failures if failures is not None else []
+
+    gate = politeness.gate(url)
+    if gate is None:
+        failures.append(f"{url}: Blocked by robots.txt")
+        return []
+    if not gate.acquire(deadline):
+        failures.append(f"{url}: Skipped: crawl time budget used up")
+        return []
+    try:
+        response = fetch(session, url, timeout=min(politeness.timeout, max(0.1, deadline - time.monotonic())))
+        root = ET.fromstring(response.content)
+    except (requests.RequestException, ET.ParseError) as e:
+        failures.append(f"{url}: Error reading sitemap: {e}")
+        return []
+    finally:
+        gate.release()
+
+    locs = [el.text.strip() for el in root.iter() if el.tag.endswith("loc") and el.text]
+    if not root.tag.endswith("sitemapindex"):
+        return locs[:max_urls]
+    urls = []
+    for child in locs:
+        if len(urls) >= max_urls:
+            break
+        urls += read_sitemap(session, child, max_urls - len(urls), politeness, deadline, failures)
+    return urls
+
+
+# --- THE CRAWL ---
+def interleave_hosts(urls):
+    """Round-robins URLs across hosts, so one slow site doesn't hold every worker."""
+    by_host = defaultdict(list)
+    for url in dict.fromkeys(urls):
+        by_host[urlsplit(url).netloc].append(url)
+    queues = list(by_host.values())
+    return [queue[i] for i in range(max(map(len, queues), default=0)) for queue in queues if i < len(queue)]
+
+
+def crawl(urls, session=None, max_workers=MAX_WORKERS, per_host=PER_HOST_LIMIT, delay=POLITENESS_DELAY,
+          budget=CRAWL_BUDGET_SECONDS, timeout=REQUEST_TIMEOUT, max_chars=MAX_TEXT_CHARS, ttl=http_cache.FRESHNESS_TTL_SECONDS,
+          politeness=None):
+    """Fetches every URL concurrently and yields {"url", "status", "text", "cache", "error", "elapsed"} as each finishes.
+
+    Pages still pending when the budget runs out are yielded with an error instead of text.
+    ttl=None turns the page cache off. Pass the politeness used for read_sitemap() to share its
+    robots.txt rules and host gates (per_host and delay then come from it).
+    """
+    session = session or make_session(max_workers)
+    politeness = politeness or Politeness(session, per_host, delay, timeout)
+    deadline = time.monotonic() + budget
+
+    def fetch_one(url):
+        start = time.monotonic()
+        result = {"url": url, "status": None, "text": "", "cache": None, "error": None}
+        try:
+            # A fresh cached copy needs no request, so it skips robots.txt and the host's queue too
+            if ttl is not None and http_cache.is_fresh(url, ttl):
+                result["text"], result["cache"] = page_text(session, url, ttl, timeout, max_chars)
+                result["status"] = 200
+                result["elapsed"] = time.monotonic() - start
+                return result
+
+            gate = politeness.gate(url)
+            if gate is None:
+                result["error"] = "Blocked by robots.txt"
+            elif not gate.acquire(deadline):
+                result["error"] = "Skipped: crawl time budget used up"
+            else:
+                try:
+                    request_timeout = min(timeout, max(0.1, deadline - time.monotonic()))
+                    if ttl is None:
+                        response = fetch(session, url, timeout=request_timeout)
+                        result["text"] = html_to_text(response.content, max_chars)
+                    else:
+                        result["text"], result["cache"] = page_text(session, url, ttl, request_timeout, max_chars)
+                    result["status"] = 200
+                finally:
+                    gate.release()
+        except Exception as e:
+            result["error"] = f"Error scraping: {e}"
+        result["elapsed"] = time.monotonic() - start
+        return result
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {pool.submit(fetch_one, url): url for url in interleave_hosts(urls)}
+    yielded = set()
+    try:
+        for future in as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+            yielded.add(future)
+            yield future.result()
+    except FuturesTimeout:
+        # Queued pages never start; in-flight ones finish within their own budget-capped timeouts
+        for future, url in futures.items():
+            if future in yielded:
+                continue
+            if future.cancel():
+                yield {"url": url, "status": None, "text": "", "cache": None, "error": "Skipped: crawl time budget used up", "elapsed": 0.0}
+            else:
+                yield future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from growth_ops.llm_cache import CACHE_DIR
+
+# --- EXTRACTED TEXT CACHE ---
+# Parsing a 300-page PDF takes seconds, and the tools used to redo it on every rerun.
+# Extracted pages are cached on the SHA-256 of the uploaded bytes: an in-process LRU in
+# front of a SQLite file (zlib-compressed JSON), so the same document is parsed once.
+
+EXTRACT_CACHE_PATH = os.path.join(CACHE_DIR, "extracted_text.sqlite")
+MEMORY_CACHE_ENTRIES = 16
+DISK_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+_lock = threading.Lock()
+_memory = OrderedDict()  # key -> list of page strings
+_stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _connect():
+    os.makedirs(os.path.dirname(EXTRACT_CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(EXTRACT_CACHE_PATH, timeout=10)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS documents ("
+        "key TEXT PRIMARY KEY, pages BLOB, size INTEGER, accessed_at REAL)"
+    )
+    return conn
+
+
+def _disk_get(key):
+    with _connect() as conn:
+        row = conn.execute("SELECT pages FROM documents WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE documents SET accessed_at = ? WHERE key = ?", (time.time(), key))
+    return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+
+
+def _disk_put(key, pages):
+    blob = zlib.compress(json.dumps(pages).encode("utf-8"))
+    with _connect() as conn:
+        conn.execute("INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?)", (key, blob, len(blob), time.time()))
+        # Least-recently-used documents go once the file is over budget
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM documents").fetchone()[0]
+        if total > DISK_CACHE_MAX_BYTES:
+            for old_key, old_size in conn.execute("SELECT key, size FROM documents ORDER BY accessed_at").fetchall():
+                if total <= DISK_CACHE_MAX_BYTES:
+                    break
+                conn.execute("DELETE FROM documents WHERE key = ?", (old_key,))
+                total -= old_size
+
+
+def _memory_put(key, pages):
+    with _lock:
+        _memory[key] = pages
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_CACHE_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def _count(stat):
+    with _lock:
+        _stats[stat] += 1
+
+
+def cached_extract(data, extract, kind="pdf"):
+    """extract(data) -> list of page strings (or any JSON value), served from cache when these bytes were seen before.
+
+    `kind` namespaces the key, so two different extractors never share entries.
+    """
+    key = f"{kind}:{content_hash(data)}"
+
+    with _lock:
+        pages = _memory.get(key)
+        if pages is not None:
+            _memory.move_to_end(key)
+    if pages is not None:
+        _count("memory_hits")
+        return pages
+
+    pages = _disk_get(key)
+    if pages is not None:
+        _count("disk_hits")
+        _memory_put(key, pages)
+        return pages
+
+    _count("misses")
+    pages = extract(data)
+    _memory_put(key, pages)
+    _disk_put(key, pages)
+    return pages
+
+
+def extract_cache_stats():
+    """Hit/miss counters for this process."""
+    with _lock:
+        return dict(_stats)
+
+
+def clear_extract_cache(disk=False):
+    with _lock:
+        _memory.clear()
+    if disk and os.path.exists(EXTRACT_CACHE_PATH):
+        with _connect() as conn:
+            conn.execute("DELETE FROM documents")
@@ -0,0 +1,128 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from growth_ops.llm_cache import CACHE_DIR
+
+# --- CONDITIONAL-GET PAGE CACHE ---
+# Competitor pages rarely change between recon runs, but every click downloaded and parsed them
+# again. Pages are kept on disk with their ETag / Last-Modified (and the parsed text). Within
+# the freshness TTL no request is made at all; after it, the page is revalidated with
+# If-None-Match / If-Modified-Since and a 304 is served from disk.
+
+HTTP_CACHE_PATH = os.path.join(CACHE_DIR, "http_pages.sqlite")
+FRESHNESS_TTL_SECONDS = 3600
+DISK_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_lock = threading.Lock()
+_stats = {"fresh": 0, "revalidated": 0, "downloaded": 0, "bytes_downloaded": 0, "bytes_saved": 0}
+
+
+def _connect():
+    os.makedirs(os.path.dirname(HTTP_CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(HTTP_CACHE_PATH, timeout=10)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS pages ("
+        "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB, text TEXT, "
+        "size INTEGER, validated_at REAL, accessed_at REAL)"
+    )
+    return conn
+
+
+def _count(**amounts):
+    with _lock:
+        for stat, amount in amounts.items():
+            _stats[stat] += amount
+
+
+def lookup(url):
+    """The cached entry for a URL ({"etag", "last_modified", "body", "text", "validated_at"}), or None."""
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT etag, last_modified, body, text, validated_at FROM pages WHERE url = ?", (url,)
+        ).fetchone()
+    if row is None:
+        return None
+    etag, last_modified, body, text, validated_at = row
+    return {"etag": etag, "last_modified": last_modified, "body": zlib.decompress(body),
+            "text": text, "validated_at": validated_at}
+
+
+def is_fresh(url, ttl=FRESHNESS_TTL_SECONDS):
+    with _connect() as conn:
+        row = conn.execute("SELECT validated_at FROM pages WHERE url = ?", (url,)).fetchone()
+    return row is not None and row[0] + ttl > time.time()
+
+
+def _store(url, etag, last_modified, body, text):
+    blob = zlib.compress(body)
+    now = time.time()
+    with _connect() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, etag, last_modified, blob, text, len(blob) + len(text.encode("utf-8")), now, now),
+        )
+        # Least-recently-used pages go once the file is over budget
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total > DISK_CACHE_MAX_BYTES:
+            for old_url, old_size in conn.execute("SELECT url, size FROM pages ORDER BY accessed_at").fetchall():
+                if total <= DISK_CACHE_MAX_BYTES:
+                    break
+                conn.execute("DELETE FROM pages WHERE url = ?", (old_url,))
+                total -= old_size
+
+
+def _touch(url, validated=False):
+    now = time.time()
+    with _connect() as conn:
+        if validated:
+            conn.execute("UPDATE pages SET validated_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+        else:
+            conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (now, url))
+
+
+def cached_text(session, url, parse, ttl=FRESHNESS_TTL_SECONDS, timeout=10):
+    """parse(page bytes) for a URL, going to the network only when the cached copy is stale.
+
+    Returns (text, outcome), outcome being "fresh" (no request), "revalidated" (304) or
+    "downloaded" (new or changed page).
+    """
+    entry = lookup(url)
+    if entry and entry["validated_at"] + ttl > time.time():
+        _touch(url)
+        _count(fresh=1, bytes_saved=len(entry["body"]))
+        return entry["text"], "fresh"
+
+    headers = {}
+    if entry and entry["etag"]:
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry["last_modified"]:
+        headers["If-Modified-Since"] = entry["last_modified"]
+    response = session.get(url, headers=headers, timeout=timeout)
+
+    if response.status_code == 304 and entry:
+        _touch(url, validated=True)
+        _count(revalidated=1, bytes_saved=len(entry["body"]))
+        return entry["text"], "revalidated"
+
+    response.raise_for_status()
+    text = parse(response.content)
+    _count(downloaded=1, bytes_downloaded=len(response.content))
+    # no-store pages (and pages without validators, once the TTL is up) are simply fetched again
+    if "no-store" not in response.headers.get("Cache-Control", ""):
+        _store(url, response.headers.get("ETag"), response.headers.get("Last-Modified"), response.content, text)
+    return text, "downloaded"
+
+
+def http_cache_stats():
+    """Counters for this process: fresh hits, 304s, downloads and bytes saved."""
+    with _lock:
+        return dict(_stats)
+
+
+def clear_http_cache():
+    if os.path.exists(HTTP_CACHE_PATH):
+        with _connect() as conn:
+            conn.execute("DELETE FROM pages")
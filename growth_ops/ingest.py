@@ -0,0 +1,163 @@
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# --- DOCUMENT INGESTION ---
+# One PDF/DOCX reader for every tool. PDF pages are extracted in a process pool (pypdf is
+# pure Python, so threads wouldn't help), yielded in order as a generator so huge files can
+# be consumed page by page, and joined once at the end instead of `text += page`. The pool is
+# started once per server with forkserver/spawn: forking the threaded Streamlit server for
+# every upload could copy a lock some other thread was holding and deadlock the worker.
+
+MAX_BYTES = 50 * 1024 * 1024   # uploads above this are refused outright
+MAX_PAGES = 1000               # extraction stops after this many pages
+PARALLEL_MIN_PAGES = 24        # below this, forking workers costs more than it saves
+PAGES_PER_TASK = 16
+POOL_WORKERS = os.cpu_count() or 1
+
+_pool = None
+_pool_lock = threading.Lock()
+_worker_reader = None  # (path, PdfReader) of the document this worker parsed last
+
+
+class DocumentTooLarge(ValueError):
+    pass
+
+
+def _check_size(data, max_bytes):
+    if max_bytes and len(data) > max_bytes:
+        raise DocumentTooLarge(f"Document is {len(data) / 1024 / 1024:.1f} MB; the limit is {max_bytes / 1024 / 1024:.0f} MB.")
+
+
+def _read_bytes(source):
+    # Streamlit uploads, open files and raw bytes all work
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    source.seek(0)
+    return source.read()
+
+
+# --- PDF ---
+def _extract_range(path, start, stop):
+    # Runs in a pool worker; a document is parsed once per worker, then serves many ranges
+    global _worker_reader
+    if _worker_reader is None or _worker_reader[0] != path:
+        from pypdf import PdfReader
+        _worker_reader = (path, PdfReader(path))
+    reader = _worker_reader[1]
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # The workers start from a clean interpreter and only import this module
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(max_workers=POOL_WORKERS, mp_context=multiprocessing.get_context(method))
+        return _pool
+
+
+def _drop_pool(pool):
+    # A worker died (e.g. out of memory); the next document gets a fresh pool
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _open_pdf(data, max_bytes):
+    from pypdf import PdfReader
+
+    _check_size(data, max_bytes)
+    return PdfReader(io.BytesIO(data))
+
+
+def iter_pdf_pages(data, max_pages=MAX_PAGES, max_bytes=MAX_BYTES, parallel=True):
+    """Yields the text of each page, in order. Large documents are split across processes."""
+    yield from _iter_reader_pages(_open_pdf(data, max_bytes), data, max_pages, parallel)
+
+
+def _iter_reader_pages(reader, data, max_pages, parallel):
+    total = len(reader.pages)
+    if max_pages:
+        total = min(total, max_pages)
+
+    if not parallel or POOL_WORKERS == 1 or total < PARALLEL_MIN_PAGES:
+        for i in range(total):
+            yield reader.pages[i].extract_text() or ""
+        return
+
+    # Workers read the document from a temp file instead of getting the bytes with every task
+    # (a unique name, since workers keep the last reader keyed by path)
+    fd, path = tempfile.mkstemp(prefix=f"ingest-{uuid.uuid4().hex}-", suffix=".pdf")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    pool = _get_pool()
+    futures = []
+    try:
+        futures = [pool.submit(_extract_range, path, start, min(start + PAGES_PER_TASK, total))
+                   for start in range(0, total, PAGES_PER_TASK)]
+        for future in futures:
+            yield from future.result()
+    except BrokenProcessPool:
+        _drop_pool(pool)
+        raise
+    finally:
+        # A consumer that stops early doesn't keep the shared pool busy with pages it never asked for
+        for future in futures:
+            future.cancel()
+        os.remove(path)
+
+
+def extract_pdf_pages(data, max_pages=MAX_PAGES, max_bytes=MAX_BYTES, parallel=True):
+    return list(iter_pdf_pages(data, max_pages, max_bytes, parallel))
+
+
+def extract_pdf_document(data, max_pages=MAX_PAGES, max_bytes=MAX_BYTES, parallel=True):
+    """{"pages": [...], "total_pages": N}: the pages read, plus the PDF's real page count.
+
+    The count comes from the same parse, so caching this dict is enough for truncation_warning().
+    """
+    reader = _open_pdf(data, max_bytes)
+    pages = list(_iter_reader_pages(reader, data, max_pages, parallel))
+    return {"pages": pages, "total_pages": len(reader.pages)}
+
+
+def truncation_warning(document, max_pages=MAX_PAGES):
+    """A message when an extract_pdf_document() result stopped at the page cap, else None."""
+    read, total = len(document["pages"]), document["total_pages"]
+    if total <= read:
+        return None
+    return f"Only the first {read:,} of {total:,} pages were read (the limit is {max_pages:,})."
+
+
+# --- DOCX ---
+def extract_docx_paragraphs(data, max_bytes=MAX_BYTES):
+    from docx import Document
+
+    _check_size(data, max_bytes)
+    return [para.text for para in Document(io.BytesIO(data)).paragraphs]
+
+
+# --- ONE ENTRY POINT ---
+def extract_pages(source, name=None, **limits):
+    """Pages of a PDF, or paragraphs of a DOCX, picked by file extension."""
+    data = _read_bytes(source)
+    name = (name or getattr(source, "name", "") or "").lower()
+    if name.endswith(".docx"):
+        return extract_docx_paragraphs(data, limits.get("max_bytes", MAX_BYTES))
+    return extract_pdf_pages(data, **limits)
+
+
+def extract_text(source, name=None, **limits):
+    """Whole text of an uploaded PDF or DOCX, joined once."""
+    return "\n".join(extract_pages(source, name, **limits))
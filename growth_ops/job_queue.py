@@ -0,0 +1,84 @@
+import hashlib
+import os
+import sqlite3
+import time
+
+from growth_ops.llm_cache import CACHE_DIR
+
+# --- PERSISTED JOB QUEUE ---
+# Batch jobs (one generated email per target row) are recorded in SQLite as they finish,
+# so a rerun, a dropped browser or a crash never throws away work that was already paid for.
+# Re-running the same batch only executes the jobs that aren't done yet.
+
+QUEUE_PATH = os.path.join(CACHE_DIR, "job_queue.sqlite")
+
+
+def content_hash(text):
+    return hashlib.sha256(str(text).encode("utf-8")).hexdigest()
+
+
+def job_key(*parts):
+    """Stable id for a job from its inputs (row hash, strategy, resume hash, ...)."""
+    return content_hash("\0".join(str(part) for part in parts))
+
+
+def _connect():
+    os.makedirs(os.path.dirname(QUEUE_PATH), exist_ok=True)
+    conn = sqlite3.connect(QUEUE_PATH, timeout=10)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS jobs ("
+        "key TEXT PRIMARY KEY, status TEXT, result TEXT, error TEXT, attempts INTEGER DEFAULT 0, updated_at REAL)"
+    )
+    return conn
+
+
+def enqueue(keys):
+    # New keys start as pending; existing ones keep their status
+    now = time.time()
+    with _connect() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO jobs (key, status, updated_at) VALUES (?, 'pending', ?)",
+            [(key, now) for key in keys],
+        )
+
+
+def completed(keys):
+    """{key: result} for every key in `keys` that already finished."""
+    keys = list(keys)
+    done = {}
+    with _connect() as conn:
+        # Chunked to stay under SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = conn.execute(
+                f"SELECT key, result FROM jobs WHERE status = 'done' AND key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            done.update(rows)
+    return done
+
+
+def mark_done(key, result):
+    with _connect() as conn:
+        conn.execute(
+            "INSERT INTO jobs (key, status, result, attempts, updated_at) VALUES (?, 'done', ?, 1, ?) "
+            "ON CONFLICT(key) DO UPDATE SET status = 'done', result = excluded.result, error = NULL, "
+            "attempts = attempts + 1, updated_at = excluded.updated_at",
+            (key, result, time.time()),
+        )
+
+
+def mark_failed(key, error):
+    with _connect() as conn:
+        conn.execute(
+            "INSERT INTO jobs (key, status, error, attempts, updated_at) VALUES (?, 'failed', ?, 1, ?) "
+            "ON CONFLICT(key) DO UPDATE SET status = 'failed', error = excluded.error, "
+            "attempts = attempts + 1, updated_at = excluded.updated_at",
+            (key, str(error), time.time()),
+        )
+
+
+def reset(keys):
+    # Forces the given jobs to run again on the next batch
+    with _connect() as conn:
+        conn.executemany("UPDATE jobs SET status = 'pending' WHERE key = ?", [(key,) for key in keys])
@@ -0,0 +1,268 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from growth_ops import telemetry
+
+# --- LLM RESPONSE CACHE ---
+# The same resume, competitor URL or persona gets re-run constantly. Responses are cached
+# on (model name, normalized prompt, generation config): a small in-process LRU in front
+# of a SQLite file that survives restarts, with a TTL and size-based eviction. Callers can
+# pass a validate() check so a malformed answer is shown once but never cached.
+
+CACHE_DIR = os.environ.get("GROWTH_OPS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "growth_ops"))
+DISK_CACHE_PATH = os.path.join(CACHE_DIR, "llm_responses.sqlite")
+
+MEMORY_CACHE_ENTRIES = 256
+DISK_CACHE_MAX_BYTES = 256 * 1024 * 1024
+CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+_lock = threading.Lock()
+_memory = OrderedDict()  # key -> (text, expires_at)
+_stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0}
+
+
+def _normalize_text(text):
+    # Indentation and trailing spaces from f-string prompts shouldn't change the key
+    return "\n".join(line.strip() for line in text.strip().splitlines())
+
+
+def cache_key(model_name, prompt, generation_config=None):
+    h = hashlib.sha256()
+    h.update(f"model:{model_name}\n".encode("utf-8"))
+    h.update(f"config:{json.dumps(generation_config, sort_keys=True, default=str)}\n".encode("utf-8"))
+    parts = prompt if isinstance(prompt, (list, tuple)) else [prompt]
+    for part in parts:
+        if isinstance(part, str):
+            h.update(b"text:" + _normalize_text(part).encode("utf-8"))
+        elif isinstance(part, dict):
+            # Inline blobs like {"mime_type": "audio/wav", "data": b"..."}
+            h.update(f"blob:{part.get('mime_type')}:".encode("utf-8"))
+            h.update(part.get("data", b""))
+        else:
+            h.update(repr(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+# --- DISK TIER (SQLite) ---
+def _connect():
+    os.makedirs(os.path.dirname(DISK_CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(DISK_CACHE_PATH, timeout=10)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS responses ("
+        "key TEXT PRIMARY KEY, model TEXT, text TEXT, size INTEGER, created_at REAL, accessed_at REAL)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+    return conn
+
+
+def _disk_get(key):
+    now = time.time()
+    with _connect() as conn:
+        row = conn.execute("SELECT text, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] + CACHE_TTL_SECONDS < now:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None
+        conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0]
+
+
+def _disk_put(key, model_name, text):
+    now = time.time()
+    size = len(text.encode("utf-8"))
+    with _connect() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+            (key, model_name, text, size, now, now),
+        )
+        # Expired rows go first, then least-recently-used ones until we're under budget
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (now - CACHE_TTL_SECONDS,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total > DISK_CACHE_MAX_BYTES:
+            for old_key, old_size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+                if total <= DISK_CACHE_MAX_BYTES:
+                    break
+                conn.execute("DELETE FROM responses WHERE key = ?", (old_key,))
+                total -= old_size
+
+
+# --- MEMORY TIER (LRU) ---
+def _memory_get(key):
+    with _lock:
+        entry = _memory.get(key)
+        if entry is None:
+            return None
+        if entry[1] < time.time():
+            del _memory[key]
+            return None
+        _memory.move_to_end(key)
+        return entry[0]
+
+
+def _memory_put(key, text):
+    with _lock:
+        _memory[key] = (text, time.time() + CACHE_TTL_SECONDS)
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_CACHE_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def _count(stat):
+    with _lock:
+        _stats[stat] += 1
+
+
+def _accepted(validate, text):
+    """True when there's no validate() or it returns something truthy without raising."""
+    if validate is None:
+        return True
+    try:
+        return bool(validate(text))
+    except Exception:
+        return False
+
+
+def _lookup(key, use_cache, validate=None):
+    """(cached text or None, outcome) where outcome is memory / disk / miss / bypass."""
+    if not use_cache:
+        _count("bypassed")
+        return None, "bypass"
+    text, outcome = _memory_get(key), "memory"
+    if text is None:
+        text, outcome = _disk_get(key), "disk"
+    # Entries cached before a check existed (or that fail it now) are dropped and regenerated
+    if text is not None and not _accepted(validate, text):
+        _forget(key)
+        text = None
+    if text is None:
+        _count("misses")
+        return None, "miss"
+    _count(f"{outcome}_hits")
+    if outcome == "disk":
+        _memory_put(key, text)
+    return text, outcome
+
+
+def _store(key, model_name, text):
+    _memory_put(key, text)
+    _disk_put(key, model_name, text)
+
+
+def _forget(key):
+    with _lock:
+        _memory.pop(key, None)
+    if os.path.exists(DISK_CACHE_PATH):
+        with _connect() as conn:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+
+# --- PUBLIC API ---
+def generate_text(model, prompt, generation_config=None, use_cache=True, validate=None):
+    """model.generate_content(prompt).text, served from cache when the same request was seen before.
+
+    Pass use_cache=False to force a fresh generation (the result still refreshes the cache).
+    validate(text) is checked before caching: if it raises or returns something falsy, the
+    text is still returned but not cached, so the next call asks the model again.
+    """
+    start = time.perf_counter()
+    key = cache_key(model.model_name, prompt, generation_config)
+    chars = telemetry.prompt_chars(prompt)
+
+    text, outcome = _lookup(key, use_cache, validate)
+    if text is not None:
+        telemetry.record("generate_content", model.model_name, time.perf_counter() - start,
+                         cache=outcome, prompt_chars=chars, response_chars=len(text))
+        return text
+
+    try:
+        if generation_config is None:
+            response = model.generate_content(prompt)
+        else:
+            response = model.generate_content(prompt, generation_config=generation_config)
+        text = response.text
+    except Exception as e:
+        telemetry.record("generate_content", model.model_name, time.perf_counter() - start,
+                         cache=outcome, prompt_chars=chars, error=f"{type(e).__name__}: {e}")
+        raise
+    wall = time.perf_counter() - start
+
+    if _accepted(validate, text):
+        _store(key, model.model_name, text)
+    prompt_tokens, output_tokens = telemetry.token_usage(model, prompt, response)
+    telemetry.record("generate_content", model.model_name, wall, cache=outcome, prompt_chars=chars,
+                     prompt_tokens=prompt_tokens, output_tokens=output_tokens, response_chars=len(text))
+    return text
+
+
+def stream_text(model, prompt, generation_config=None, use_cache=True, validate=None):
+    """Like generate_text(), but yields the response in pieces as they arrive (stream=True).
+
+    A cache hit yields the whole text at once. The response is only cached once the stream
+    has been read to the end (and passes validate(), if given).
+    """
+    start = time.perf_counter()
+    key = cache_key(model.model_name, prompt, generation_config)
+    chars = telemetry.prompt_chars(prompt)
+
+    text, outcome = _lookup(key, use_cache, validate)
+    if text is not None:
+        telemetry.record("generate_content", model.model_name, time.perf_counter() - start,
+                         cache=outcome, stream=True, prompt_chars=chars, response_chars=len(text))
+        yield text
+        return
+
+    kwargs = {"stream": True}
+    if generation_config is not None:
+        kwargs["generation_config"] = generation_config
+    pieces = []
+    ttft = None
+    chunk = None
+    try:
+        for chunk in model.generate_content(prompt, **kwargs):
+            if ttft is None:
+                ttft = time.perf_counter() - start
+            pieces.append(chunk.text)
+            yield chunk.text
+    except Exception as e:
+        telemetry.record("generate_content", model.model_name, time.perf_counter() - start,
+                         cache=outcome, stream=True, prompt_chars=chars, error=f"{type(e).__name__}: {e}")
+        raise
+    wall = time.perf_counter() - start
+    text = "".join(pieces)
+
+    if _accepted(validate, text):
+        _store(key, model.model_name, text)
+    # The last chunk carries the usage totals for the whole stream
+    prompt_tokens, output_tokens = telemetry.token_usage(model, prompt, chunk)
+    telemetry.record("generate_content", model.model_name, wall, cache=outcome, stream=True,
+                     ttft=round(ttft if ttft is not None else wall, 4), prompt_chars=chars,
+                     prompt_tokens=prompt_tokens, output_tokens=output_tokens, response_chars=len(text))
+
+
+def discard(model, prompt, generation_config=None):
+    """Drops a cached response, e.g. generated code that failed when it was run."""
+    _forget(cache_key(model.model_name, prompt, generation_config))
+
+
+def cache_stats():
+    """Hit/miss counters for this process."""
+    with _lock:
+        stats = dict(_stats)
+    lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+    stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+    return stats
+
+
+def clear_cache(disk=False):
+    with _lock:
+        _memory.clear()
+    if disk and os.path.exists(DISK_CACHE_PATH):
+        with _connect() as conn:
+            conn.execute("DELETE FROM responses")
@@ -0,0 +1,191 @@
+import json
+import random
+import sys
+import threading
+import time
+import types
+from collections import deque
+
+# --- LOCAL GEMINI STAND-IN ---
+# Mirrors the slice of google.generativeai the tools use: configure(), list_models(),
+# GenerativeModel.generate_content() (plain, streamed, with inline audio parts) and
+# count_tokens(). Latency, failures and 429s are configurable, so the apps can be
+# load-tested without touching real quota. install() swaps it in for the real SDK.
+
+try:
+    from google.api_core.exceptions import InternalServerError, ResourceExhausted
+except ImportError:
+    class ResourceExhausted(Exception):
+        code = 429
+
+    class InternalServerError(Exception):
+        code = 500
+
+SETTINGS = {
+    "latency": 0.4,             # seconds before the first token
+    "jitter": 0.1,              # +/- random spread on that latency
+    "tokens_per_second": 150,   # decode speed once the answer starts
+    "response_words": 200,
+    "chunk_words": 12,          # words per streamed chunk
+    "error_rate": 0.0,          # share of calls failing with a 500
+    "rpm_limit": None,          # requests per minute before 429s start
+    "models": ["models/gemini-1.5-flash", "models/gemini-1.5-pro", "models/embedding-001"],
+}
+
+_lock = threading.Lock()
+_recent = deque()  # request timestamps inside the last minute
+_stats = {"calls": 0, "streamed": 0, "errors": 0, "rate_limited": 0}
+_rng = random.Random(0)
+
+WORDS = ("growth pipeline revenue signal churn funnel founder pricing retention hook "
+         "insight leverage cohort launch metric outreach audit roadmap").split()
+
+
+def configure(api_key=None, **kwargs):
+    return None
+
+
+def set_mock(**settings):
+    """Changes latency / error / quota behaviour, e.g. set_mock(latency=1.0, rpm_limit=60)."""
+    unknown = set(settings) - set(SETTINGS)
+    if unknown:
+        raise KeyError(f"Unknown mock settings: {sorted(unknown)}")
+    SETTINGS.update(settings)
+
+
+def mock_stats():
+    with _lock:
+        return dict(_stats)
+
+
+def reset_mock(seed=0):
+    with _lock:
+        _recent.clear()
+        for stat in _stats:
+            _stats[stat] = 0
+    _rng.seed(seed)
+
+
+def list_models():
+    return [
+        types.SimpleNamespace(
+            name=name,
+            supported_generation_methods=["embedContent"] if "embedding" in name else ["generateContent", "countTokens"],
+        )
+        for name in SETTINGS["models"]
+    ]
+
+
+# --- REQUEST SHAPING ---
+def _parts(contents):
+    return contents if isinstance(contents, (list, tuple)) else [contents]
+
+
+def _prompt_text(contents):
+    return " ".join(part for part in _parts(contents) if isinstance(part, str))
+
+
+def _token_count(contents):
+    tokens = 0
+    for part in _parts(contents):
+        if isinstance(part, str):
+            tokens += max(1, len(part) // 4)
+        elif isinstance(part, dict):
+            # Gemini bills audio at ~32 tokens per second; assume 16 kHz 16-bit WAV
+            tokens += len(part.get("data", b"")) // 32000 * 32 + 1
+    return tokens
+
+
+def _admit():
+    # Quota and error injection happen up front, like the real API
+    now = time.monotonic()
+    with _lock:
+        _stats["calls"] += 1
+        while _recent and _recent[0] < now - 60:
+            _recent.popleft()
+        if SETTINGS["rpm_limit"] and len(_recent) >= SETTINGS["rpm_limit"]:
+            _stats["rate_limited"] += 1
+            raise ResourceExhausted("429 Quota exceeded for generate_content requests per minute (mock)")
+        _recent.append(now)
+        if _rng.random() < SETTINGS["error_rate"]:
+            _stats["errors"] += 1
+            raise InternalServerError("500 An internal error has occurred (mock)")
+        delay = max(0.0, SETTINGS["latency"] + _rng.uniform(-SETTINGS["jitter"], SETTINGS["jitter"]))
+    return delay
+
+
+def _answer(contents):
+    prompt = _prompt_text(contents)
+    seed = sum(map(ord, prompt[-200:]))
+    words = [WORDS[(seed + i * 7) % len(WORDS)] for i in range(SETTINGS["response_words"])]
+    body = " ".join(words)
+    if any(isinstance(part, dict) for part in _parts(contents)):
+        body = "(heard the audio) " + body
+    if "JSON" in prompt:
+        # Match whichever shape the prompt asks for first
+        start = prompt.index("JSON")
+        list_at, object_at = prompt.find("[", start), prompt.find("{", start)
+        if list_at != -1 and (object_at == -1 or list_at < object_at):
+            return json.dumps([{"slide": i, "title": words[i], "body": body[:80]} for i in range(1, 6)])
+        return json.dumps({"mock": True, "summary": body[:120], "email_draft": body})
+    return body
+
+
+class _Response:
+    def __init__(self, text, prompt_tokens, output_chars=None):
+        # Streamed chunks carry the running totals, like the real API
+        output_tokens = max(1, (len(text) if output_chars is None else output_chars) // 4)
+        self.text = text
+        self.usage_metadata = types.SimpleNamespace(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=output_tokens,
+            total_token_count=prompt_tokens + output_tokens,
+        )
+
+
+class GenerativeModel:
+    def __init__(self, model_name="gemini-1.5-flash", generation_config=None, **kwargs):
+        self.model_name = model_name if model_name.startswith("models/") else f"models/{model_name}"
+        self._generation_config = generation_config
+
+    def count_tokens(self, contents):
+        return types.SimpleNamespace(total_tokens=_token_count(contents))
+
+    def generate_content(self, contents, generation_config=None, stream=False, **kwargs):
+        delay = _admit()
+        text = _answer(contents)
+        prompt_tokens = _token_count(contents)
+        if not stream:
+            time.sleep(delay + len(text) / 4 / SETTINGS["tokens_per_second"])
+            return _Response(text, prompt_tokens)
+
+        with _lock:
+            _stats["streamed"] += 1
+        words = text.split(" ")
+        step = SETTINGS["chunk_words"]
+
+        def chunks():
+            time.sleep(delay)
+            sent = 0
+            for start in range(0, len(words), step):
+                piece = " ".join(words[start:start + step])
+                if start + step < len(words):
+                    piece += " "
+                time.sleep(len(piece) / 4 / SETTINGS["tokens_per_second"])
+                sent += len(piece)
+                yield _Response(piece, prompt_tokens, output_chars=sent)
+
+        return chunks()
+
+
+def install():
+    """Makes `import google.generativeai` resolve to this module. Call before importing the apps."""
+    module = sys.modules[__name__]
+    if "google" not in sys.modules:
+        try:
+            import google  # noqa: F401
+        except ImportError:
+            sys.modules["google"] = types.ModuleType("google")
+    sys.modules["google.generativeai"] = module
+    sys.modules["google"].generativeai = module
+    return module
@@ -0,0 +1,87 @@
+import hashlib
+import threading
+import time
+
+import google.generativeai as genai
+
+from growth_ops import telemetry
+
+# --- MODEL RESOLVER ---
+# Every tool used to call genai.list_models() before each generation: a full network
+# round trip per click. The model list is cached per API key for MODEL_TTL_SECONDS, and one
+# GenerativeModel instance is reused per (API key, model name).
+
+MODEL_TTL_SECONDS = 600
+
+# Priority: Flash (Fast) -> Pro (Smart) -> First available
+DEFAULT_PREFERENCES = ("flash", "pro")
+
+_lock = threading.Lock()
+_available = {}  # key hash -> (model names, expires_at)
+_models = {}     # (key hash, model_name) -> GenerativeModel
+
+
+def _key_id(api_key):
+    # Never keep raw keys around as dict keys
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+
+
+def list_generation_models():
+    """Names of every model the configured key can call generateContent on."""
+    start = time.perf_counter()
+    try:
+        names = [m.name for m in genai.list_models() if 'generateContent' in m.supported_generation_methods]
+    except Exception as e:
+        telemetry.record("list_models", wall=time.perf_counter() - start, error=f"{type(e).__name__}: {e}")
+        raise
+    telemetry.record("list_models", wall=time.perf_counter() - start, models=len(names))
+    return names
+
+
+def pick_model(available_models, preferences=DEFAULT_PREFERENCES):
+    for keyword in preferences:
+        model_name = next((m for m in available_models if keyword in m), None)
+        if model_name:
+            return model_name
+    return available_models[0] if available_models else None
+
+
+def available_models(api_key=None):
+    """list_generation_models(), cached per API key for MODEL_TTL_SECONDS."""
+    key_id = _key_id(api_key)
+    with _lock:
+        cached = _available.get(key_id)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
+    names = list_generation_models()
+    if names:
+        # An empty list isn't cached, so a key that just got access works on the next click
+        with _lock:
+            _available[key_id] = (names, time.monotonic() + MODEL_TTL_SECONDS)
+    return names
+
+
+def resolve_model_name(api_key=None, preferences=DEFAULT_PREFERENCES):
+    """Best available model name for this key, or None if it has none."""
+    return pick_model(available_models(api_key), preferences)
+
+
+def get_model(api_key=None, preferences=DEFAULT_PREFERENCES):
+    """Returns (model_name, GenerativeModel), or (None, None) if the key has no generation models."""
+    model_name = resolve_model_name(api_key, preferences)
+    if model_name is None:
+        return None, None
+
+    cache_key = (_key_id(api_key), model_name)
+    with _lock:
+        model = _models.get(cache_key)
+        if model is None:
+            model = _models[cache_key] = genai.GenerativeModel(model_name)
+    return model_name, model
+
+
+def clear_model_cache():
+    with _lock:
+        _available.clear()
+        _models.clear()
@@ -0,0 +1,87 @@
+import heapq
+import math
+import re
+from collections import Counter
+
+# --- BM25 RETRIEVAL ---
+# Pasting a whole 300-page PDF into every prompt costs hundreds of thousands of tokens per
+# question. Pages are cut into paragraph-sized chunks, indexed once into a BM25 inverted
+# index, and only the best few chunks (with their page numbers) go to the model.
+
+CHUNK_CHARS = 1200
+TOP_K = 6
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have how i in is it its of on or that the their "
+    "this to was were what when where which who why will with you your our we they does did do".split()
+)
+
+
+def tokenize(text):
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _pieces(page_text):
+    # Paragraphs when the PDF has blank lines between them, otherwise plain lines
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", page_text) if p.strip()]
+    if len(paragraphs) <= 1:
+        paragraphs = [line.strip() for line in page_text.splitlines() if line.strip()]
+    for paragraph in paragraphs:
+        # A single giant paragraph still gets cut to size
+        for start in range(0, len(paragraph), CHUNK_CHARS):
+            yield paragraph[start:start + CHUNK_CHARS]
+
+
+def chunk_pages(pages, chunk_chars=CHUNK_CHARS):
+    """Packs each page's paragraphs into ~chunk_chars chunks: [{"page": 1, "text": ...}, ...]."""
+    chunks = []
+    for page_number, page_text in enumerate(pages, start=1):
+        current = ""
+        for piece in _pieces(page_text or ""):
+            if current and len(current) + len(piece) + 1 > chunk_chars:
+                chunks.append({"page": page_number, "text": current})
+                current = ""
+            current = f"{current}\n{piece}" if current else piece
+        if current:
+            chunks.append({"page": page_number, "text": current})
+    return chunks
+
+
+class BM25Index:
+    """Okapi BM25 over a list of chunks. Build once per document, then search() per question."""
+
+    def __init__(self, chunks, k1=BM25_K1, b=BM25_B):
+        self.chunks = chunks
+        self.k1, self.b = k1, b
+        self.postings = {}  # term -> [(chunk id, term frequency), ...]
+        self.lengths = []
+        for chunk_id, chunk in enumerate(chunks):
+            counts = Counter(tokenize(chunk["text"]))
+            self.lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self.postings.setdefault(term, []).append((chunk_id, tf))
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        n = len(chunks)
+        self.idf = {term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for term, p in self.postings.items()}
+
+    def search(self, query, k=TOP_K):
+        """Top-k chunks for the query, best first, each with its BM25 score."""
+        scores = {}
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for chunk_id, tf in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[chunk_id] / self.avg_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [dict(self.chunks[chunk_id], score=score) for chunk_id, score in best]
+
+
+def format_context(hits):
+    """Chunks as prompt context, in document order, each tagged with its page for citations."""
+    ordered = sorted(hits, key=lambda hit: hit["page"])
+    return "\n\n".join(f"[Page {hit['page']}]\n{hit['text']}" for hit in ordered)
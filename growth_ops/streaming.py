@@ -0,0 +1,36 @@
+import time
+from collections import deque
+
+from growth_ops.llm_cache import stream_text
+
+# --- STREAMED RENDERING ---
+# Long answers feel slow when nothing shows up until the last token. These helpers render
+# the response into an st.empty() placeholder as it streams and time every call.
+
+CURSOR = "▌"
+LATENCY_LOG = deque(maxlen=1000)  # one {"model", "ttft", "total", "chars"} per call
+
+
+def stream_markdown(placeholder, model, prompt, wrap=None, use_cache=True):
+    """Streams the answer into `placeholder` (an st.empty()); returns (text, timings).
+
+    `wrap(text)` lets chat UIs put the partial answer inside their own HTML bubble.
+    """
+    start = time.perf_counter()
+    ttft = None
+    text = ""
+    for piece in stream_text(model, prompt, use_cache=use_cache):
+        if ttft is None:
+            ttft = time.perf_counter() - start
+        text += piece
+        placeholder.markdown(wrap(text + CURSOR) if wrap else text + CURSOR, unsafe_allow_html=wrap is not None)
+    placeholder.markdown(wrap(text) if wrap else text, unsafe_allow_html=wrap is not None)
+
+    total = time.perf_counter() - start
+    timings = {"model": model.model_name, "ttft": total if ttft is None else ttft, "total": total, "chars": len(text)}
+    LATENCY_LOG.append(timings)
+    return text, timings
+
+
+def latency_caption(timings):
+    return f"⏱️ First token {timings['ttft']:.2f}s · Total {timings['total']:.2f}s"
@@ -0,0 +1,174 @@
+import json
+import os
+import sys
+import threading
+import time
+
+# --- LLM TELEMETRY ---
+# Every generate_content / list_models call made through growth_ops is recorded here:
+# wall time, prompt and response size, token counts, model, app, cache outcome, retries.
+# Calls are appended to a rolling JSONL log shared by all the tools, and each process keeps
+# a Prometheus text file (node_exporter textfile format) with its running totals.
+
+# Same root as the LLM cache (not imported from llm_cache, which imports this module)
+CACHE_DIR = os.environ.get("GROWTH_OPS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "growth_ops"))
+TELEMETRY_DIR = os.path.join(CACHE_DIR, "telemetry")
+CALL_LOG_PATH = os.path.join(TELEMETRY_DIR, "llm_calls.jsonl")
+CALL_LOG_MAX_BYTES = 10 * 1024 * 1024  # rotated to llm_calls.jsonl.1 past this
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Usage metadata on the response is free; count_tokens() costs a round trip, so it's only
+# the fallback when a response carries no usage numbers
+COUNT_TOKENS_FALLBACK = True
+
+_lock = threading.Lock()
+_app_name = None
+_counters = {}    # (metric, labels) -> value
+_histograms = {}  # labels -> [bucket counts..., sum, count]
+
+
+def set_app(name):
+    """Names the tool calls are attributed to (defaults to the running script's folder)."""
+    global _app_name
+    _app_name = name
+
+
+def app_name():
+    if _app_name:
+        return _app_name
+    # `streamlit run "11_boardroom_brain/main.py"` -> "11_boardroom_brain"
+    main_file = getattr(sys.modules.get("__main__"), "__file__", None) or (sys.argv[0] if sys.argv else "")
+    return os.path.basename(os.path.dirname(os.path.abspath(main_file))) or "unknown"
+
+
+def prompt_chars(prompt):
+    parts = prompt if isinstance(prompt, (list, tuple)) else [prompt]
+    return sum(len(part) for part in parts if isinstance(part, str))
+
+
+def token_usage(model, prompt, response=None):
+    """(prompt_tokens, output_tokens) from the response's usage metadata, else count_tokens()."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None and getattr(usage, "prompt_token_count", None):
+        return usage.prompt_token_count, getattr(usage, "candidates_token_count", 0) or 0
+    if COUNT_TOKENS_FALLBACK and model is not None:
+        try:
+            return model.count_tokens(prompt).total_tokens, None
+        except Exception:
+            pass
+    return None, None
+
+
+# --- RECORDING ---
+def record(op, model_name=None, wall=0.0, **fields):
+    """Logs one call. Usual fields: prompt_chars, prompt_tokens, output_tokens, response_chars,
+    cache ("memory" / "disk" / "miss" / "bypass"), stream, ttft, retries, error."""
+    event = {"ts": round(time.time(), 3), "app": app_name(), "op": op, "model": model_name, "wall": round(wall, 4)}
+    event.update({key: value for key, value in fields.items() if value is not None})
+    _aggregate(event)
+    _append_log(event)
+    _write_metrics()
+    return event
+
+
+def _add(metric, labels, amount=1):
+    _counters[(metric, labels)] = _counters.get((metric, labels), 0) + amount
+
+
+def _aggregate(event):
+    app, op, model = event["app"], event["op"], event.get("model") or ""
+    with _lock:
+        if op == "retry":
+            _add("growth_ops_llm_retries_total", (("app", app), ("model", model)))
+            return
+        _add("growth_ops_llm_calls_total", (("app", app), ("op", op), ("model", model), ("cache", event.get("cache", "none"))))
+        if "error" in event:
+            _add("growth_ops_llm_errors_total", (("app", app), ("op", op), ("model", model)))
+        for field, metric in (("prompt_chars", "growth_ops_llm_prompt_chars_total"),
+                              ("response_chars", "growth_ops_llm_response_chars_total"),
+                              ("prompt_tokens", "growth_ops_llm_prompt_tokens_total"),
+                              ("output_tokens", "growth_ops_llm_output_tokens_total")):
+            if event.get(field):
+                _add(metric, (("app", app), ("model", model)), event[field])
+
+        labels = (("app", app), ("op", op))
+        histogram = _histograms.setdefault(labels, [0] * len(LATENCY_BUCKETS) + [0.0, 0])
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if event["wall"] <= bound:
+                histogram[i] += 1
+        histogram[-2] += event["wall"]
+        histogram[-1] += 1
+
+
+def _append_log(event):
+    try:
+        os.makedirs(TELEMETRY_DIR, exist_ok=True)
+        if os.path.exists(CALL_LOG_PATH) and os.path.getsize(CALL_LOG_PATH) > CALL_LOG_MAX_BYTES:
+            os.replace(CALL_LOG_PATH, CALL_LOG_PATH + ".1")
+        with open(CALL_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(event, default=str) + "\n")
+    except OSError:
+        pass  # Telemetry must never break a generation
+
+
+# --- PROMETHEUS EXPORT ---
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs):
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in pairs)
+
+
+def prometheus_text():
+    """Current totals in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        seen = set()
+        for (metric, labels), value in sorted(_counters.items()):
+            if metric not in seen:
+                lines.append(f"# TYPE {metric} counter")
+                seen.add(metric)
+            lines.append(f"{metric}{{{_labels(labels)}}} {value}")
+
+        if _histograms:
+            lines.append("# TYPE growth_ops_llm_latency_seconds histogram")
+        for labels, histogram in sorted(_histograms.items()):
+            for bound, count in zip(LATENCY_BUCKETS, histogram):
+                lines.append(f"growth_ops_llm_latency_seconds_bucket{{{_labels(labels + (('le', bound),))}}} {count}")
+            lines.append(f"growth_ops_llm_latency_seconds_bucket{{{_labels(labels + (('le', '+Inf'),))}}} {histogram[-1]}")
+            lines.append(f"growth_ops_llm_latency_seconds_sum{{{_labels(labels)}}} {histogram[-2]:.4f}")
+            lines.append(f"growth_ops_llm_latency_seconds_count{{{_labels(labels)}}} {histogram[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+def metrics_path():
+    # One file per tool; the textfile collector merges every *.prom in the folder
+    return os.path.join(TELEMETRY_DIR, f"llm_{app_name()}.prom")
+
+
+def _write_metrics():
+    path = metrics_path()
+    try:
+        os.makedirs(TELEMETRY_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(prometheus_text())
+        os.replace(tmp, path)  # scrapers never see a half-written file
+    except OSError:
+        pass
+
+
+def read_call_log():
+    """Every logged call (rotated file first) as a list of dicts."""
+    events = []
+    for path in (CALL_LOG_PATH + ".1", CALL_LOG_PATH):
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # a line cut short by a crash
+    return events
@@ -2,6 +2,13 @@ import streamlit as st
 import google.generativeai as genai
 import pandas as pd
 import plotly.express as px
+import os
+import sys
+
+# Shared helpers live in growth_ops/ at the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from growth_ops.models import get_model
+from growth_ops.llm_cache import generate_text, discard
 
 # --- 1. CONFIG ---
 st.set_page_config(page_title="Insight Engine", page_icon="📊", layout="wide")
@@ -24,15 +31,19 @@ with st.sidebar:
     uploaded_file = st.file_uploader("Upload Data", type=['csv', 'xlsx'])
 
 # --- 3. THE BRAIN (CODE GENERATION) ---
+def clean_code(text):
+    return text.replace("```python", "").replace("```", "").strip()
+
 def analyze_and_plot(df, query):
+    """Returns (code, forget); call forget() if the code fails so it isn't served from cache again."""
     # 1. Get dataset info to give context to AI
     columns = list(df.columns)
     data_sample = df.head(3).to_string()
     
-    # 2. Select Model (Auto-detect logic)
-    available_models = [m.name for m in genai.list_models() if 'generateContent' in m.supported_generation_methods]
-    model_name = next((m for m in available_models if 'flash' in m), available_models[0])
-    model = genai.GenerativeModel(model_name)
+    # 2. Select Model (Auto-detect logic, cached per API key)
+    model_name, model = get_model(api_key, preferences=("flash",))
+    if model is None:
+        raise RuntimeError("Your API Key has no access to generation models.")
 
     # 3. Prompt: "Write Python code to visualize this"
     prompt = f"""
@@ -57,8 +68,9 @@ def analyze_and_plot(df, query):
     Return ONLY the raw Python code. No markdown formatting (no ```python).
     """
     
-    response = model.generate_content(prompt)
-    return response.text.replace("```python", "").replace("```", "").strip()
+    # Code that doesn't even parse is never cached
+    code = clean_code(generate_text(model, prompt, validate=lambda text: compile(clean_code(text), "<generated>", "exec")))
+    return code, lambda: discard(model, prompt)
 
 # --- 4. THE UI ---
 st.title("📊 The Insight Engine")
@@ -83,9 +95,10 @@ if uploaded_file and api_key:
     
     if st.button("🚀 Analyze"):
         with st.spinner("Consulting the AI Analyst..."):
+            forget = None
             try:
                 # 1. Get the Code from AI
-                generated_code = analyze_and_plot(df, query)
+                generated_code, forget = analyze_and_plot(df, query)
                 
                 # 2. Show the code (Transparency)
                 with st.expander("See Generated Python Code"):
@@ -105,6 +118,9 @@ if uploaded_file and api_key:
                     st.warning("The AI ran the code but didn't generate a 'fig' or 'answer' variable.")
                     
             except Exception as e:
+                # Code that failed to run shouldn't come back from the cache on the next try
+                if forget:
+                    forget()
                 st.error(f"Execution Error: {e}")
                 st.info("Try rephrasing your prompt to be more specific about the columns.")
 
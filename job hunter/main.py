@@ -1,9 +1,15 @@
+import os
+import sys
 import streamlit as st
 import google.generativeai as genai
 import pandas as pd
-import time
-from pypdf import PdfReader
-from docx import Document
+
+# Shared helpers live in growth_ops/ at the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from growth_ops.llm_cache import generate_text
+from growth_ops.batch import run_batch, estimate_tokens
+from growth_ops import job_queue
+from growth_ops.ingest import extract_text
 
 # --- 1. CONFIGURATION ---
 st.set_page_config(page_title="Job Hunt HQ", page_icon="⚡", layout="wide")
@@ -30,6 +36,11 @@ MY VOICE (FOUNDER MODE):
 - Focus on "What I can build for you tomorrow."
 """
 
+# Batch quota (free-tier Flash limits); the executor stays under both
+BATCH_WORKERS = 8
+QUOTA_RPM = 15
+QUOTA_TPM = 1_000_000
+
 # Setup AI
 try:
     genai.configure(api_key=GOOGLE_API_KEY)
@@ -63,11 +74,11 @@ st.markdown(f"""
 
 # --- 3. FUNCTIONS ---
 def get_pdf_text(uploaded_file):
-    try: return "".join([page.extract_text() for page in PdfReader(uploaded_file).pages])
+    try: return extract_text(uploaded_file)
     except: return ""
 
 def get_docx_text(uploaded_file):
-    try: return "\n".join([para.text for para in Document(uploaded_file).paragraphs])
+    try: return extract_text(uploaded_file)
     except: return ""
 
 # --- 4. SIDEBAR ---
@@ -94,12 +105,12 @@ with tab1:
     if st.button("🔥 ROAST RESUME", use_container_width=True):
         if resume_text:
             prompt = f"Act as a brutal YC Founder. Roast this resume: {resume_text}. Be mean."
-            st.markdown(model.generate_content(prompt).text)
+            st.markdown(generate_text(model, prompt))
     
     if st.button("✨ OPTIMIZE BULLETS", use_container_width=True):
         if resume_text and jd_text:
             prompt = f"Rewrite top 3 bullets of: {resume_text} for JD: {jd_text}. Use numbers. Context: {dna_context}"
-            st.markdown(model.generate_content(prompt).text)
+            st.markdown(generate_text(model, prompt))
 
 with tab2:
     st.subheader("🚀 TARGET LIST SEGMENTATION")
@@ -137,12 +148,14 @@ with tab2:
         }
     )
 
+    regenerate = st.checkbox("🔄 Regenerate emails that were already written")
+
     if st.button("⚡ EXECUTE BATCH", type="primary", use_container_width=True):
         if resume_text and jd_text:
             progress = st.progress(0)
-            for i, row in edited_df.iterrows():
-                progress.progress((i + 1) / len(edited_df))
-                
+            rows = [row for _, row in edited_df.iterrows()]
+            prompts = []
+            for row in rows:
                 current_strategy = row['Strategy']
                 
                 # --- INTELLIGENT PROMPT ---
@@ -167,14 +180,55 @@ with tab2:
                 3. First line must hook them immediately.
                 4. Sign off with the name found in the 'MY DNA' section.
                 """
-                
+                prompts.append(prompt)
+            
+            # Persisted queue: each job is keyed by its inputs, so re-runs skip what's already written
+            resume_hash, jd_hash, dna_hash = (job_queue.content_hash(t) for t in (resume_text, jd_text, dna_context))
+            keys = [
+                job_queue.job_key(job_queue.content_hash(row.drop(labels="Strategy").to_json()), row['Strategy'], resume_hash, jd_hash, dna_hash)
+                for row in rows
+            ]
+            if regenerate:
+                job_queue.reset(keys)
+            job_queue.enqueue(keys)
+            finished = job_queue.completed(keys)
+            pending = [i for i, key in enumerate(keys) if key not in finished]
+            if finished:
+                st.caption(f"♻️ {len(rows) - len(pending)} of {len(rows)} emails restored from the last run. Generating the rest...")
+            
+            def write_email(i):
+                # Runs on a worker thread; the result is saved before it ever reaches the UI
                 try:
-                    res = model.generate_content(prompt)
-                    with st.expander(f"✉️ {row['Name']} ({current_strategy})", expanded=True):
-                        st.code(res.text, language="text")
-                    time.sleep(2) # Prevent Rate Limits
+                    email = generate_text(model, prompts[i], use_cache=not regenerate)
                 except Exception as e:
-                    st.error(f"Failed for {row['Name']}: {e}")
+                    job_queue.mark_failed(keys[i], e)
+                    raise
+                job_queue.mark_done(keys[i], email)
+                return email
+            
+            # One slot per row keeps the on-screen order stable while results arrive out of order
+            slots = [st.empty() for _ in rows]
+            def show(i, email, error):
+                row = rows[i]
+                with slots[i].container():
+                    if error is None:
+                        with st.expander(f"✉️ {row['Name']} ({row['Strategy']})", expanded=True):
+                            st.code(email, language="text")
+                    else:
+                        st.error(f"Failed for {row['Name']}: {error}")
+            
+            for i, key in enumerate(keys):
+                if key in finished:
+                    show(i, finished[key], None)
+            done = len(rows) - len(pending)
+            if rows:
+                progress.progress(done / len(rows))
+            
+            batch = run_batch(write_email, pending, max_workers=BATCH_WORKERS, rpm=QUOTA_RPM, tpm=QUOTA_TPM, cost=lambda i: estimate_tokens(prompts[i]))
+            for j, email, error in batch:
+                show(pending[j], email, error)
+                done += 1
+                progress.progress(done / len(rows))
             
             st.success("BATCH COMPLETE")
             progress.empty()
@@ -0,0 +1,117 @@
+import re
+import os
+import sys
+import time
+import random
+import tempfile
+import importlib.machinery
+import importlib.util
+
+# --- 1. SETUP ---
+# Compares the original two scans against the extractor's scanners, and checks that both find
+# exactly the same emails and phones, including where they overlap ("5551234567@x.com") and
+# when the extractor streams the file instead of reading it whole.
+# Usage: python lead_extractor_benchmark.py [size_in_mb | path/to/raw_data.txt]
+corpus_mb = 100
+
+# The patterns as they were before the scanners were tuned, kept here as the reference
+ORIGINAL_EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+ORIGINAL_PHONE_PATTERN = r'(\+\d{1,3}[- ]?)?\(?\d{3}\)?[- ]?\d{3}[- ]?\d{4}'
+# Tokens where an email and a phone share characters, or one email runs straight into the next
+OVERLAP_CASES = [
+    "+91 9876543210x@y.com",
+    "5551234567@x.com",
+    "john5551234567@example.com",
+    "555 123 4567@x.com",
+    "a@b.com5x@y.com",
+    "(555) 123-4567.sales@x.io",
+]
+extractor_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Day5_Lead_Extractor")
+
+def load_extractor():
+    # The extractor is a script without a .py extension, so load it by path
+    loader = importlib.machinery.SourceFileLoader("lead_extractor", extractor_path)
+    spec = importlib.util.spec_from_loader("lead_extractor", loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+# --- 2. SYNTHETIC CORPUS ---
+def build_corpus(size_mb, seed=42):
+    """Scraped-page-like text: mostly words, ~2% emails, ~2% phone numbers (some glued to a word),
+    plus a few overlapping email/phone tokens."""
+    rng = random.Random(seed)
+    words = ["contact", "sales", "team", "pricing", "call", "us", "at", "the", "founder", "growth", "hello", "email"]
+    target = size_mb * 1024 * 1024
+    parts, size = [], 0
+    while size < target:
+        roll = rng.random()
+        if roll < 0.02:
+            part = f"lead{rng.randint(0, 99999)}@company{rng.randint(0, 999)}.com"
+        elif roll < 0.03:
+            part = f"+91 {rng.randint(10**9, 10**10 - 1)}"
+        elif roll < 0.04:
+            # Scraped labels often lose their separator: "tel5551234567", "Ph+91 9876543210"
+            part = rng.choice(["tel", "Ph", "Mob", "call"]) + rng.choice(["", "+1 ", "+91 "]) + str(rng.randint(10**9, 10**10 - 1))
+        elif roll < 0.041:
+            # Emails and phones that overlap: both scans must still report each of them
+            part = rng.choice(OVERLAP_CASES)
+        else:
+            part = rng.choice(words)
+        parts.append(part)
+        size += len(part) + 1
+    return " ".join(parts)
+
+# --- 3. THE SCANNERS ---
+def two_pass(text_content):
+    # The old path: one full scan per original pattern. finditer + group() gives the whole match
+    # (findall would return only the phone's country-code group).
+    emails = {m.group() for m in re.finditer(ORIGINAL_EMAIL_PATTERN, text_content)}
+    phones = {m.group() for m in re.finditer(ORIGINAL_PHONE_PATTERN, text_content)}
+    return emails, phones
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+# --- EXECUTION ---
+if __name__ == "__main__":
+    extractor = load_extractor()
+    arg = sys.argv[1] if len(sys.argv) > 1 else str(corpus_mb)
+
+    if os.path.exists(arg):
+        print(f"📂 Loading {arg}...")
+        with open(arg, "r", encoding="utf-8") as f:
+            text_content = f.read()
+    else:
+        print(f"🧪 Building a {arg} MB synthetic corpus...")
+        text_content = build_corpus(int(arg))
+
+    # The overlap cases on their own first, so a mismatch there names the token
+    for case in OVERLAP_CASES:
+        assert extractor.scan_leads(case) == two_pass(case), f"mismatch on {case!r}"
+
+    (old_emails, old_phones), old_time = timed(two_pass, text_content)
+    (new_emails, new_phones), new_time = timed(extractor.scan_leads, text_content)
+
+    mb = len(text_content) / (1024 * 1024)
+    print("-------------------------------")
+    print(f"🐢 Two-pass scan    : {old_time:.2f}s ({mb / old_time:.1f} MB/s)")
+    print(f"⚡ Tuned scan       : {new_time:.2f}s ({mb / new_time:.1f} MB/s)")
+    print(f"🚀 Speedup          : {old_time / new_time:.2f}x")
+    print("-------------------------------")
+    print(f"✅ Emails: {len(old_emails)} -> {len(new_emails)}")
+    print(f"✅ Phones: {len(old_phones)} -> {len(new_phones)}")
+    assert new_emails == old_emails, f"email mismatch, e.g. {sorted(new_emails ^ old_emails)[:5]}"
+    assert new_phones == old_phones, f"phone mismatch, e.g. {sorted(new_phones ^ old_phones)[:5]}"
+
+    # Streaming must agree with the in-memory scan, with small chunks so matches straddle them
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", encoding="utf-8", delete=False) as f:
+        f.write(text_content[:2 * 1024 * 1024])
+    try:
+        extractor.chunk_size, extractor.chunk_overlap = 4096, 256
+        assert extractor.stream_leads(f.name) == two_pass(text_content[:2 * 1024 * 1024]), "streaming mismatch"
+        print("✅ Streaming scan matches")
+    finally:
+        os.remove(f.name)
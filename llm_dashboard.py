@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import pandas as pd
+import streamlit as st
+
+# Shared helpers live in growth_ops/ at the repo root
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from growth_ops import telemetry
+
+# --- 1. APP CONFIGURATION ---
+# Reads the call log every Gemini tool writes (growth_ops/telemetry.py). Run: streamlit run llm_dashboard.py
+st.set_page_config(page_title="LLM Telemetry", page_icon="📈", layout="wide")
+
+WINDOWS = {"Last hour": 3600, "Last 24 hours": 86400, "Last 7 days": 7 * 86400, "All time": None}
+COLUMNS = ["ts", "app", "op", "model", "wall", "cache", "prompt_chars", "prompt_tokens", "output_tokens", "response_chars", "ttft", "error"]
+
+@st.cache_data(ttl=10)
+def load_calls():
+    return pd.DataFrame(telemetry.read_call_log()).reindex(columns=COLUMNS)
+
+def app_summary(calls, retries):
+    # Per-app latency percentiles, token spend and cache behaviour
+    grouped = calls.groupby("app")
+    summary = pd.DataFrame({
+        "Calls": grouped.size(),
+        "p50 (s)": grouped["wall"].quantile(0.5),
+        "p95 (s)": grouped["wall"].quantile(0.95),
+        "Prompt tokens": grouped["prompt_tokens"].sum(),
+        "Output tokens": grouped["output_tokens"].sum(),
+        "Cache hit rate": grouped["cache"].apply(lambda c: c.isin(["memory", "disk"]).mean()),
+        "Errors": grouped["error"].count(),
+    })
+    summary["Retries"] = retries.groupby("app").size().reindex(summary.index, fill_value=0)
+    return summary.sort_values("Prompt tokens", ascending=False)
+
+# --- 2. THE UI ---
+st.title("📈 LLM Telemetry")
+st.caption(f"Call log: `{telemetry.CALL_LOG_PATH}` · Prometheus files: `{telemetry.TELEMETRY_DIR}/llm_*.prom`")
+
+window = st.selectbox("Window", list(WINDOWS))
+if st.button("🔄 Refresh"):
+    load_calls.clear()
+
+calls = load_calls()
+if WINDOWS[window]:
+    calls = calls[calls["ts"] >= time.time() - WINDOWS[window]]
+
+if calls.empty:
+    st.info("No LLM calls logged yet. Use any of the Gemini tools and come back.")
+else:
+    generations = calls[calls["op"] == "generate_content"]
+    retries = calls[calls["op"] == "retry"]
+    fresh = generations[generations["cache"].isin(["miss", "bypass"])]
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Generations", f"{len(generations):,}")
+    col2.metric("p95 latency (uncached)", f"{fresh['wall'].quantile(0.95):.2f}s" if len(fresh) else "-")
+    col3.metric("Tokens spent", f"{int(generations['prompt_tokens'].sum() + generations['output_tokens'].sum()):,}")
+    col4.metric("Cache hit rate", f"{generations['cache'].isin(['memory', 'disk']).mean():.0%}" if len(generations) else "-")
+
+    # --- 3. PER-APP BREAKDOWN ---
+    st.subheader("🧰 Per App")
+    summary = app_summary(generations, retries)
+    st.dataframe(summary.style.format({"p50 (s)": "{:.2f}", "p95 (s)": "{:.2f}", "Cache hit rate": "{:.0%}",
+                                       "Prompt tokens": "{:,.0f}", "Output tokens": "{:,.0f}"}),
+                 width="stretch")
+
+    chart1, chart2 = st.columns(2)
+    chart1.caption("p95 latency (s), uncached calls")
+    chart1.bar_chart(fresh.groupby("app")["wall"].quantile(0.95))
+    chart2.caption("Token spend")
+    chart2.bar_chart(summary[["Prompt tokens", "Output tokens"]])
+
+    # --- 4. RAW CALLS ---
+    with st.expander("🔍 Recent calls"):
+        st.dataframe(calls.sort_values("ts", ascending=False).head(500), width="stretch")
@@ -0,0 +1,100 @@
+import io
+import os
+import sys
+import time
+import random
+
+from pypdf import PdfReader
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from growth_ops import ingest
+
+# --- 1. SETUP ---
+# Compares the old serial `text += page.extract_text()` loop against growth_ops.ingest.
+# Usage: python pdf_ingest_benchmark.py [pages | path/to/file.pdf]
+page_count = 500
+
+# --- 2. SYNTHETIC PDF ---
+def build_pdf(pages, lines_per_page=55, seed=42):
+    """Minimal text-only PDF (Helvetica, one content stream per page), no extra dependencies."""
+    rng = random.Random(seed)
+    words = ["revenue", "board", "quarter", "growth", "pipeline", "churn", "runway", "hiring", "margin", "forecast"]
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    def escape(line):
+        return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = font + 2 * pages + 1  # the /Pages object comes right after every page
+    kids = []
+    for number in range(1, pages + 1):
+        lines = [f"Page {number}."] + [" ".join(rng.choice(words) for _ in range(12)) for _ in range(lines_per_page)]
+        stream = ("BT /F1 10 Tf 40 780 Td 12 TL " + " ".join(f"({escape(line)}) '" for line in lines) + " ET").encode("latin-1")
+        content = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        kids.append(add(b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+                        b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (pages_id, content, font)))
+    add(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)))
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(out)
+
+# --- 3. THE TWO READERS ---
+def serial_concat(data):
+    # The old path every tool had: one reader, one page at a time, string concatenation
+    text = ""
+    for page in PdfReader(io.BytesIO(data)).pages:
+        text += page.extract_text()
+    return text
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+# --- EXECUTION ---
+if __name__ == "__main__":
+    arg = sys.argv[1] if len(sys.argv) > 1 else str(page_count)
+
+    if os.path.exists(arg):
+        print(f"📂 Loading {arg}...")
+        with open(arg, "rb") as f:
+            data = f.read()
+    else:
+        print(f"🧪 Building a {arg}-page synthetic PDF...")
+        data = build_pdf(int(arg))
+
+    workers = os.cpu_count() or 1
+    old_text, old_time = timed(serial_concat, data)
+    new_text, new_time = timed(ingest.extract_text, data, max_pages=None)
+
+    # First page available to a streaming consumer (the generator path)
+    start = time.perf_counter()
+    pages = ingest.iter_pdf_pages(data, max_pages=None)
+    next(pages)
+    first_page = time.perf_counter() - start
+    pages.close()
+
+    mb = len(data) / (1024 * 1024)
+    print("-------------------------------")
+    print(f"📄 Document          : {mb:.1f} MB, {len(PdfReader(io.BytesIO(data)).pages)} pages, {workers} CPU core(s)")
+    print(f"🐢 Serial += loop    : {old_time:.2f}s")
+    print(f"⚡ Parallel ingest   : {new_time:.2f}s")
+    print(f"🚀 Speedup           : {old_time / new_time:.2f}x")
+    print(f"⏱️ First page (iter) : {first_page * 1000:.0f} ms")
+    print("-------------------------------")
+    # Pages are now joined with newlines; the words themselves must be identical
+    same = old_text.split() == new_text.split() or "".join(old_text.split()) == "".join(new_text.split())
+    print(f"✅ Same text: {same} ({len(old_text):,} -> {len(new_text):,} chars)")